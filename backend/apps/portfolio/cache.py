@@ -0,0 +1,65 @@
+"""
+Response caching for Portfolio read endpoints.
+Short-lived per-user caching of successful API responses.
+"""
+from functools import wraps
+import logging
+
+from django.core.cache import cache
+from rest_framework.response import Response
+
+logger = logging.getLogger('apps')
+
+RESPONSE_CACHE_TIMEOUT = 30  # seconds
+
+# Endpoints wrapped with cache_response (by view method name)
+CACHED_ENDPOINTS = (
+    'summary',
+    'investment_overview',
+    'pnl_metrics',
+    'holdings_analytics',
+    'allocation',
+    'dashboard',
+)
+
+
+def response_cache_key(endpoint: str, user_id) -> str:
+    """Build the cache key for an endpoint's response for a user."""
+    return f'portfolio_response_{endpoint}_{user_id}'
+
+
+def response_cache_keys(user_id) -> list:
+    """Get all response cache keys for a user (used for invalidation)."""
+    return [response_cache_key(endpoint, user_id) for endpoint in CACHED_ENDPOINTS]
+
+
+def cache_response(timeout=RESPONSE_CACHE_TIMEOUT):
+    """
+    Cache successful responses of a ViewSet action per user.
+    
+    Only 200 responses are cached. Keys are cleared by the portfolio and
+    holdings services whenever a sync completes.
+    
+    Args:
+        timeout: Cache TTL in seconds
+    """
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            cache_key = response_cache_key(view_method.__name__, request.user.id)
+            
+            cached_data = cache.get(cache_key)
+            if cached_data:
+                logger.debug("Response cache hit: %s", cache_key)
+                return Response(cached_data)
+            
+            response = view_method(self, request, *args, **kwargs)
+            
+            if response.status_code == 200:
+                cache.set(cache_key, response.data, timeout)
+            
+            return response
+        
+        return wrapper
+    
+    return decorator
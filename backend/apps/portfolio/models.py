@@ -4,6 +4,8 @@ Stores portfolio summaries, holdings, and historical snapshots.
 """
 from mongoengine import Document, EmbeddedDocument, fields
 from django.utils import timezone
+from bson import ObjectId
+from pymongo import ReplaceOne
 import logging
 
 logger = logging.getLogger('apps')
@@ -44,6 +46,13 @@ class Portfolio(Document):
     options_count = fields.IntField(default=0)
     crypto_count = fields.IntField(default=0)
     
+    # Top Holding (precomputed on holdings sync)
+    top_holding_symbol = fields.StringField(max_length=20)
+    top_holding_company_name = fields.StringField(max_length=200)
+    top_holding_asset_type = fields.StringField(choices=['stock', 'option', 'crypto'])
+    top_holding_market_value = fields.DecimalField(precision=2)
+    top_holding_quantity = fields.DecimalField(precision=8)
+    
     # Margin & Leverage Metrics (NEW - Enhanced Dashboard)
     margin_invested = fields.DecimalField(precision=2, default=0.0)
     margin_available = fields.DecimalField(precision=2, default=0.0)
@@ -89,12 +98,26 @@ class Portfolio(Document):
         )
     
     @classmethod
-    def get_or_create_for_user(cls, user_id, account_id):
-        """Get existing portfolio or create new one."""
-        portfolio = cls.objects(
+    def get_for_user(cls, user_id, account_id):
+        """
+        Get existing portfolio without creating one.
+        
+        Single seek on the unique (user_id, robinhood_account_id) index;
+        the default '-last_updated' ordering is dropped since at most one
+        document can match.
+        
+        Returns:
+            Portfolio instance or None
+        """
+        return cls.objects(
             user_id=user_id,
             robinhood_account_id=account_id
-        ).first()
+        ).order_by().first()
+    
+    @classmethod
+    def get_or_create_for_user(cls, user_id, account_id):
+        """Get existing portfolio or create new one."""
+        portfolio = cls.get_for_user(user_id, account_id)
         
         if not portfolio:
             portfolio = cls(
@@ -233,12 +256,136 @@ class Holding(Document):
         )
     
     @classmethod
-    def get_user_holdings(cls, user_id, active_only=True):
-        """Get all holdings for a user."""
+    def bulk_save(cls, holdings):
+        """
+        Insert or update many holdings in a single bulk write.
+        
+        New holdings get their ObjectId assigned up front, so inserts and
+        updates are the same upserting replace and no existence check is
+        needed. The driver splits very large batches on its own.
+        
+        Args:
+            holdings: Iterable of Holding instances
+            
+        Returns:
+            Number of holdings written
+        """
+        operations = []
+        for holding in holdings:
+            holding.validate()
+            if holding.id is None:
+                holding.id = ObjectId()
+            operations.append(
+                ReplaceOne({'_id': holding.id}, holding.to_mongo(), upsert=True)
+            )
+        
+        if operations:
+            cls._get_collection().bulk_write(operations, ordered=False)
+        
+        return len(operations)
+    
+    @classmethod
+    def close_missing_positions(cls, user_id, asset_type, current_symbols):
+        """
+        Mark active holdings whose symbol is no longer held as closed.
+        
+        Returns:
+            Number of positions closed
+        """
+        return cls.objects(
+            user_id=user_id,
+            asset_type=asset_type,
+            is_active=True,
+            symbol__nin=list(current_symbols)
+        ).update(set__is_active=False, set__closed_at=timezone.now())
+    
+    @classmethod
+    def get_user_holdings(cls, user_id, active_only=True, fields=None):
+        """
+        Get all holdings for a user.
+        
+        Args:
+            user_id: User ID
+            active_only: Only return open positions
+            fields: Optional field names to load; other fields are left
+                unset, so only pass this for read-only use
+        """
         query = {'user_id': user_id}
         if active_only:
             query['is_active'] = True
-        return cls.objects(**query)
+        holdings = cls.objects(**query)
+        if fields:
+            holdings = holdings.only(*fields)
+        return holdings
+    
+    @classmethod
+    def get_user_holdings_lite(cls, user_id):
+        """
+        Get active holdings for a user as plain dicts with float values.
+        
+        Skips Document instantiation so analytics code can consume the
+        values directly. DecimalField is stored as a BSON double, so the
+        raw values already decode to float without a Decimal round trip.
+        """
+        holdings = cls.objects(user_id=user_id, is_active=True).only(
+            'symbol', 'company_name', 'asset_type', 'quantity', 'market_value'
+        ).as_pymongo()
+        
+        return [
+            {
+                'symbol': h['symbol'],
+                'company_name': h.get('company_name') or h['symbol'],
+                'asset_type': h['asset_type'],
+                'quantity': h.get('quantity') or 0.0,
+                'market_value': h.get('market_value') or 0.0,
+            }
+            for h in holdings
+        ]
+    
+    @classmethod
+    def get_allocation_data(cls, user_id, account_id):
+        """
+        Get active holdings with allocation percentages, largest first.
+        
+        The portfolio total is read first; projection, percentage
+        arithmetic and sorting then run server-side in one plain
+        aggregation over the holdings. A missing portfolio yields 0%
+        allocations.
+        
+        Args:
+            user_id: User ID
+            account_id: Robinhood account ID of the portfolio
+            
+        Returns:
+            List of allocation dictionaries
+        """
+        total_value = Portfolio.objects(
+            user_id=user_id,
+            robinhood_account_id=account_id
+        ).order_by().scalar('total_value').first()
+        portfolio_value = float(total_value or 0)
+        
+        market_value = {'$toDouble': '$market_value'}
+        
+        if portfolio_value > 0:
+            allocation_percent = {'$multiply': [{'$divide': [market_value, portfolio_value]}, 100]}
+        else:
+            allocation_percent = {'$literal': 0}
+        
+        pipeline = [
+            {'$project': {
+                '_id': 0,
+                'symbol': 1,
+                'company_name': {'$ifNull': ['$company_name', '$symbol']},
+                'asset_type': 1,
+                'market_value': market_value,
+                'allocation_percent': allocation_percent,
+                'quantity': {'$toDouble': '$quantity'},
+            }},
+            {'$sort': {'allocation_percent': -1}},
+        ]
+        
+        return list(cls.objects(user_id=user_id, is_active=True).aggregate(pipeline))
     
     @classmethod
     def get_holding_by_symbol(cls, user_id, symbol, asset_type='stock'):
@@ -311,6 +458,8 @@ class PortfolioSnapshot(Document):
         'indexes': [
             'user_id',
             'robinhood_account_id',
+            # Serves historical/performance/YTD range queries; ascending
+            # sorts walk it backwards, so no separate ascending index is needed
             {'fields': ['user_id', '-timestamp']},
             {'fields': ['robinhood_account_id', '-timestamp']},
             {'fields': ['snapshot_type', '-timestamp']},
@@ -80,6 +80,11 @@ class SyncPortfolioSerializer(serializers.Serializer):
         required=False,
         help_text="Force a full sync instead of incremental"
     )
+    background = serializers.BooleanField(
+        default=False,
+        required=False,
+        help_text="Queue the sync as a background task and return immediately"
+    )
 
 
 class SyncResponseSerializer(serializers.Serializer):
@@ -10,7 +10,8 @@ from django.utils import timezone
 
 from apps.portfolio.models import Holding, Portfolio
 from apps.robinhood.models import RobinhoodAccount
-from apps.robinhood.client import RobinhoodClient
+from apps.robinhood.client import RobinhoodClient, create_robinhood_client
+from apps.portfolio.cache import response_cache_keys
 from core.exceptions import PortfolioSyncError
 
 logger = logging.getLogger('apps')
@@ -29,13 +30,16 @@ class HoldingsService:
     
     CACHE_TIMEOUT = 900  # 15 minutes
     
-    def __init__(self, user, robinhood_account: Optional[RobinhoodAccount] = None):
+    def __init__(self, user, robinhood_account: Optional[RobinhoodAccount] = None,
+                 rh_client: Optional[RobinhoodClient] = None):
         """
         Initialize holdings service.
         
         Args:
             user: Django User instance
             robinhood_account: RobinhoodAccount instance (optional)
+            rh_client: RobinhoodClient to reuse (optional), e.g. one already
+                shared with another service for the same account
         """
         self.user = user
         self.robinhood_account = robinhood_account
@@ -48,7 +52,7 @@ class HoldingsService:
             else:
                 raise ValueError(f"No Robinhood account found for user {user.id}")
         
-        self.rh_client = RobinhoodClient(self.robinhood_account)
+        self.rh_client = rh_client or create_robinhood_client(self.robinhood_account)
     
     def get_holdings(self, use_cache=True) -> List[Dict[str, Any]]:
         """
@@ -111,12 +115,24 @@ class HoldingsService:
             if rh_positions is None:
                 raise PortfolioSyncError("No positions data returned from Robinhood")
             
+            # Load existing stock holdings once instead of per position
+            existing_holdings = {
+                holding.symbol: holding
+                for holding in Holding.objects(
+                    user_id=self.user.id,
+                    asset_type='stock',
+                    is_active=True
+                )
+            }
+            
             # Track symbols we've seen
             current_symbols = set()
             
             # Process each position
+            holdings_to_save = []
             holdings_created = 0
             holdings_updated = 0
+            now = timezone.now()
             
             for rh_position in rh_positions:
                 # Skip zero quantity positions
@@ -129,16 +145,14 @@ class HoldingsService:
                 symbol = holding_data['symbol']
                 current_symbols.add(symbol)
                 
-                # Get or create holding
-                existing_holding = Holding.get_holding_by_symbol(
-                    user_id=self.user.id,
-                    symbol=symbol,
-                    asset_type='stock'
-                )
+                holding = existing_holdings.get(symbol)
                 
-                if existing_holding:
+                if holding:
                     # Update existing holding
-                    existing_holding.update_from_data(holding_data)
+                    for key, value in holding_data.items():
+                        if value is not None:
+                            setattr(holding, key, value)
+                    holding.last_updated = now
                     holdings_updated += 1
                 else:
                     # Create new holding
@@ -148,15 +162,20 @@ class HoldingsService:
                         asset_type='stock',
                         **holding_data
                     )
-                    holding.calculate_pl()
-                    holding.save()
                     holdings_created += 1
+                
+                holding.calculate_pl()
+                holdings_to_save.append(holding)
+            
+            # Write all new and changed holdings in one round trip
+            Holding.bulk_save(holdings_to_save)
             
             # Mark closed positions (symbols not in current positions)
-            all_holdings = Holding.get_user_holdings(self.user.id, active_only=True)
-            for holding in all_holdings:
-                if holding.symbol not in current_symbols and holding.asset_type == 'stock':
-                    holding.close_position()
+            holdings_closed = Holding.close_missing_positions(
+                user_id=self.user.id,
+                asset_type='stock',
+                current_symbols=current_symbols
+            )
             
             # Update portfolio totals
             self._update_portfolio_totals()
@@ -170,6 +189,7 @@ class HoldingsService:
                     'user_id': self.user.id,
                     'holdings_created': holdings_created,
                     'holdings_updated': holdings_updated,
+                    'holdings_closed': holdings_closed,
                     'total_holdings': holdings_created + holdings_updated
                 }
             )
@@ -266,6 +286,7 @@ class HoldingsService:
         Calculates:
         - Total stocks value
         - Holdings counts
+        - Top holding by market value
         - Updates Portfolio document
         """
         portfolio = Portfolio.get_or_create_for_user(
@@ -273,8 +294,12 @@ class HoldingsService:
             account_id=self.robinhood_account.id
         )
         
-        # Get all active holdings
-        holdings = Holding.get_user_holdings(self.user.id, active_only=True)
+        # Get all active holdings (only the fields aggregated below)
+        holdings = Holding.get_user_holdings(
+            self.user.id,
+            active_only=True,
+            fields=('symbol', 'company_name', 'asset_type', 'quantity', 'market_value', 'total_pl')
+        )
         
         # Calculate totals
         stocks_value = Decimal('0')
@@ -286,6 +311,7 @@ class HoldingsService:
         crypto_count = 0
         
         total_pl = Decimal('0')
+        top_holding = None
         
         for holding in holdings:
             if holding.asset_type == 'stock':
@@ -299,6 +325,9 @@ class HoldingsService:
                 crypto_count += 1
             
             total_pl += holding.total_pl
+            
+            if top_holding is None or holding.market_value > top_holding.market_value:
+                top_holding = holding
         
         # Calculate total P&L percentage
         total_cost_basis = stocks_value + options_value + crypto_value - total_pl
@@ -315,6 +344,13 @@ class HoldingsService:
         portfolio.total_pl = total_pl
         portfolio.total_pl_percent = total_pl_percent
         
+        # Materialize top holding so analytics reads don't rescan holdings
+        portfolio.top_holding_symbol = top_holding.symbol if top_holding else None
+        portfolio.top_holding_company_name = top_holding.company_name if top_holding else None
+        portfolio.top_holding_asset_type = top_holding.asset_type if top_holding else None
+        portfolio.top_holding_market_value = top_holding.market_value if top_holding else None
+        portfolio.top_holding_quantity = top_holding.quantity if top_holding else None
+        
         # Update total equity if not set
         if portfolio.total_equity == 0:
             portfolio.total_equity = stocks_value + options_value + crypto_value
@@ -356,6 +392,8 @@ class HoldingsService:
         cache_keys = [
             f'holdings_list_{self.user.id}',
             f'portfolio_summary_{self.user.id}',
+            f'holdings_analytics_{self.user.id}',
+            *response_cache_keys(self.user.id),
         ]
         
         for key in cache_keys:
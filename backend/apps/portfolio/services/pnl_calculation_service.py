@@ -157,7 +157,11 @@ class PnLCalculationService:
             current_value = portfolio.total_value
             
             # Get all active holdings
-            holdings = Holding.get_user_holdings(self.user.id, active_only=True)
+            holdings = Holding.get_user_holdings(
+                self.user.id,
+                active_only=True,
+                fields=('symbol', 'quantity', 'market_value')
+            )
             
             if not holdings:
                 logger.info(f"No holdings found for user {self.user.id}")
@@ -167,10 +171,12 @@ class PnLCalculationService:
             previous_close_value = Decimal('0')
             symbols_processed = 0
             
+            # Get quotes (with previous_close) for all holdings in one request
+            quotes = self.rh_client.get_stock_quotes([holding.symbol for holding in holdings])
+            
             for holding in holdings:
                 try:
-                    # Get quote with previous_close
-                    quote = self.rh_client.get_stock_quote(holding.symbol)
+                    quote = quotes.get(holding.symbol)
                     
                     if not quote:
                         logger.warning(f"No quote data for {holding.symbol}")
@@ -10,7 +10,8 @@ from django.utils import timezone
 
 from apps.portfolio.models import Portfolio, PortfolioSnapshot
 from apps.robinhood.models import RobinhoodAccount
-from apps.robinhood.client import RobinhoodClient
+from apps.robinhood.client import RobinhoodClient, create_robinhood_client
+from apps.portfolio.cache import response_cache_keys
 from core.exceptions import PortfolioSyncError
 
 logger = logging.getLogger('apps')
@@ -29,13 +30,16 @@ class PortfolioService:
     
     CACHE_TIMEOUT = 900  # 15 minutes
     
-    def __init__(self, user, robinhood_account: Optional[RobinhoodAccount] = None):
+    def __init__(self, user, robinhood_account: Optional[RobinhoodAccount] = None,
+                 rh_client: Optional[RobinhoodClient] = None):
         """
         Initialize portfolio service.
         
         Args:
             user: Django User instance
             robinhood_account: RobinhoodAccount instance (optional)
+            rh_client: RobinhoodClient to reuse (optional), e.g. one already
+                shared with another service for the same account
         """
         self.user = user
         self.robinhood_account = robinhood_account
@@ -48,7 +52,7 @@ class PortfolioService:
             else:
                 raise ValueError(f"No Robinhood account found for user {user.id}")
         
-        self.rh_client = RobinhoodClient(self.robinhood_account)
+        self.rh_client = rh_client or create_robinhood_client(self.robinhood_account)
     
     def get_portfolio_summary(self, use_cache=True) -> Dict[str, Any]:
         """
@@ -128,8 +132,10 @@ class PortfolioService:
             # Update sync status to pending
             self.robinhood_account.update_sync_status('pending')
             
-            # Fetch portfolio data from Robinhood (using cached session)
-            rh_portfolio_data = self.rh_client.get_portfolio()
+            # Fetch portfolio data from Robinhood (using cached session).
+            # Always a live call: cached or stale data must never be
+            # recorded as a successful sync.
+            rh_portfolio_data = self.rh_client.get_portfolio(use_cache=False)
             
             if not rh_portfolio_data:
                 raise PortfolioSyncError("No portfolio data returned from Robinhood")
@@ -254,6 +260,8 @@ class PortfolioService:
         cache_keys = [
             f'portfolio_summary_{self.user.id}',
             f'holdings_list_{self.user.id}',
+            f'holdings_analytics_{self.user.id}',
+            *response_cache_keys(self.user.id),
         ]
         
         for key in cache_keys:
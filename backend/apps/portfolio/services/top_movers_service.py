@@ -3,8 +3,10 @@ Top Movers Service - Analyze holdings to find top winners and losers.
 Identifies best and worst performing positions for the current trading day.
 """
 from decimal import Decimal
+from operator import itemgetter
 import logging
 from typing import Dict, Any, List, Optional
+from django.core.cache import cache
 
 from apps.portfolio.models import Portfolio, Holding
 from apps.robinhood.client import RobinhoodClient
@@ -22,6 +24,8 @@ class TopMoversService:
     - Top winners/losers by dollar change (today)
     """
     
+    CACHE_TIMEOUT = 60  # 1 minute - dashboard polling hits warm cache
+    
     def __init__(self, user, robinhood_client: RobinhoodClient):
         """
         Initialize top movers service.
@@ -37,6 +41,10 @@ class TopMoversService:
         """
         Get the largest holding by market value (concentration risk).
         
+        Reads the top holding precomputed on the Portfolio during holdings
+        sync, falling back to scanning holdings for portfolios that have
+        not been synced since it was introduced.
+        
         Args:
             portfolio: Portfolio instance
             
@@ -44,32 +52,36 @@ class TopMoversService:
             Dict with top holding info or None if no holdings
         """
         try:
-            # Get holdings sorted by market value (descending)
-            holdings = Holding.get_user_holdings(self.user.id, active_only=True)
-            
-            if not holdings:
-                return None
-            
-            # Sort by market value
-            sorted_holdings = sorted(
-                holdings,
-                key=lambda h: float(h.market_value),
-                reverse=True
-            )
-            
-            top_holding = sorted_holdings[0]
             portfolio_value = float(portfolio.total_value)
             
+            if portfolio.top_holding_symbol:
+                market_value = float(portfolio.top_holding_market_value or 0)
+                top_holding = {
+                    'symbol': portfolio.top_holding_symbol,
+                    'company_name': portfolio.top_holding_company_name or portfolio.top_holding_symbol,
+                    'market_value': market_value,
+                    'quantity': float(portfolio.top_holding_quantity or 0),
+                    'asset_type': portfolio.top_holding_asset_type,
+                }
+            else:
+                holdings = Holding.get_user_holdings_lite(self.user.id)
+                
+                if not holdings:
+                    return None
+                
+                # Largest holding by market value
+                top_holding = max(holdings, key=itemgetter('market_value'))
+            
             # Calculate allocation percentage
-            allocation_percent = (float(top_holding.market_value) / portfolio_value * 100) if portfolio_value > 0 else 0
+            allocation_percent = (top_holding['market_value'] / portfolio_value * 100) if portfolio_value > 0 else 0
             
             return {
-                'symbol': top_holding.symbol,
-                'company_name': top_holding.company_name or top_holding.symbol,
-                'market_value': float(top_holding.market_value),
+                'symbol': top_holding['symbol'],
+                'company_name': top_holding['company_name'],
+                'market_value': top_holding['market_value'],
                 'allocation_percent': allocation_percent,
-                'quantity': float(top_holding.quantity),
-                'asset_type': top_holding.asset_type
+                'quantity': top_holding['quantity'],
+                'asset_type': top_holding['asset_type']
             }
         
         except Exception as e:
@@ -80,35 +92,20 @@ class TopMoversService:
         """
         Get holdings count and breakdown.
         
+        Counts are maintained on the Portfolio by holdings sync.
+        
         Args:
             portfolio: Portfolio instance
             
         Returns:
             Dict with holdings analytics
         """
-        try:
-            holdings = Holding.get_user_holdings(self.user.id, active_only=True)
-            
-            # Count by asset type
-            stocks_count = sum(1 for h in holdings if h.asset_type == 'stock')
-            options_count = sum(1 for h in holdings if h.asset_type == 'option')
-            crypto_count = sum(1 for h in holdings if h.asset_type == 'crypto')
-            
-            return {
-                'total_holdings': len(holdings),
-                'stocks_count': stocks_count,
-                'options_count': options_count,
-                'crypto_count': crypto_count
-            }
-        
-        except Exception as e:
-            logger.error(f"Error getting holdings analytics: {str(e)}", exc_info=True)
-            return {
-                'total_holdings': 0,
-                'stocks_count': 0,
-                'options_count': 0,
-                'crypto_count': 0
-            }
+        return {
+            'total_holdings': portfolio.holdings_count or 0,
+            'stocks_count': portfolio.stocks_count or 0,
+            'options_count': portfolio.options_count or 0,
+            'crypto_count': portfolio.crypto_count or 0
+        }
     
     def get_top_movers(self, portfolio: Portfolio) -> Dict[str, Any]:
         """
@@ -121,7 +118,7 @@ class TopMoversService:
             Dict with top movers data
         """
         try:
-            holdings = list(Holding.get_user_holdings(self.user.id, active_only=True))
+            holdings = Holding.get_user_holdings_lite(self.user.id)
             
             if not holdings:
                 return self._empty_movers_response()
@@ -129,10 +126,12 @@ class TopMoversService:
             # Calculate today's changes for all holdings
             holdings_with_changes = []
             
+            # Get quotes (with previous_close) for all holdings in one request
+            quotes = self.rh_client.get_stock_quotes([holding['symbol'] for holding in holdings])
+            
             for holding in holdings:
                 try:
-                    # Get quote with previous_close
-                    quote = self.rh_client.get_stock_quote(holding.symbol)
+                    quote = quotes.get(holding['symbol'])
                     
                     if not quote:
                         continue
@@ -146,23 +145,23 @@ class TopMoversService:
                     # Calculate changes
                     price_change = current_price - previous_close
                     percent_change = (price_change / previous_close * Decimal('100'))
-                    dollar_change = price_change * holding.quantity
+                    dollar_change = float(price_change) * holding['quantity']
                     
                     holdings_with_changes.append({
-                        'symbol': holding.symbol,
-                        'company_name': holding.company_name or holding.symbol,
-                        'asset_type': holding.asset_type,
-                        'quantity': float(holding.quantity),
+                        'symbol': holding['symbol'],
+                        'company_name': holding['company_name'],
+                        'asset_type': holding['asset_type'],
+                        'quantity': holding['quantity'],
                         'current_price': float(current_price),
                         'previous_close': float(previous_close),
                         'price_change': float(price_change),
                         'percent_change': float(percent_change),
-                        'dollar_change': float(dollar_change),
-                        'market_value': float(holding.market_value)
+                        'dollar_change': dollar_change,
+                        'market_value': holding['market_value']
                     })
                 
                 except Exception as e:
-                    logger.warning(f"Error calculating changes for {holding.symbol}: {str(e)}")
+                    logger.warning(f"Error calculating changes for {holding['symbol']}: {str(e)}")
                     continue
             
             if not holdings_with_changes:
@@ -206,8 +205,9 @@ class TopMoversService:
         if not holdings:
             return None
         
-        sorted_holdings = sorted(holdings, key=lambda h: h[sort_key], reverse=reverse)
-        top = sorted_holdings[0]
+        # Single O(n) pass - only the extreme element is needed
+        pick = max if reverse else min
+        top = pick(holdings, key=itemgetter(sort_key))
         
         return {
             'symbol': top['symbol'],
@@ -237,21 +237,30 @@ class TopMoversService:
             'holdings_analyzed': 0
         }
     
-    def get_complete_analytics(self, portfolio: Portfolio) -> Dict[str, Any]:
+    def get_complete_analytics(self, portfolio: Portfolio, use_cache=True) -> Dict[str, Any]:
         """
-        Get complete holdings analytics overview.
+        Get complete holdings analytics overview with caching.
         
         Args:
             portfolio: Portfolio instance
+            use_cache: Whether to use Redis cache
             
         Returns:
             Dict formatted for API response with all analytics
         """
+        cache_key = f'holdings_analytics_{self.user.id}'
+        
+        if use_cache:
+            cached_data = cache.get(cache_key)
+            if cached_data:
+                logger.debug(f"Holdings analytics cache hit for user {self.user.id}")
+                return cached_data
+        
         top_holding = self.get_top_holding(portfolio)
         holdings_analytics = self.get_holdings_analytics(portfolio)
         top_movers = self.get_top_movers(portfolio)
         
-        return {
+        analytics = {
             # Holdings count and breakdown
             'total_holdings': holdings_analytics['total_holdings'],
             'stocks_count': holdings_analytics['stocks_count'],
@@ -270,3 +279,10 @@ class TopMoversService:
             # Metadata
             'holdings_analyzed': top_movers['holdings_analyzed']
         }
+        
+        # Cache the result
+        if use_cache:
+            cache.set(cache_key, analytics, self.CACHE_TIMEOUT)
+            logger.debug(f"Holdings analytics cached for user {self.user.id}")
+        
+        return analytics
@@ -2,6 +2,8 @@
 Celery tasks for Portfolio app.
 Background jobs for data synchronization and maintenance.
 """
+from itertools import islice
+
 from celery import shared_task
 from celery.utils.log import get_task_logger
 from django.contrib.auth import get_user_model
@@ -9,17 +11,29 @@ from django.utils import timezone
 
 from .services import PortfolioService, HoldingsService
 from apps.robinhood.models import RobinhoodAccount
-from core.exceptions import PortfolioSyncError
+from core.exceptions import PortfolioSyncError, RobinhoodAPIError
 
 logger = get_task_logger(__name__)
 User = get_user_model()
 
 
-@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+@shared_task(
+    bind=True,
+    autoretry_for=(PortfolioSyncError, RobinhoodAPIError),
+    retry_backoff=60,
+    retry_backoff_max=600,
+    retry_jitter=True,
+    max_retries=3,
+)
 def sync_portfolio_task(self, user_id, account_id=None):
     """
     Background task to sync portfolio data from Robinhood.
     
+    Sync and Robinhood API failures are retried with exponential backoff
+    and jitter so that many failing tasks don't retry in lockstep against
+    Robinhood. Deterministic failures (missing user or account, bad
+    stored credentials) fail straight away.
+    
     Args:
         user_id: User ID
         account_id: Optional specific Robinhood account ID
@@ -65,19 +79,9 @@ def sync_portfolio_task(self, user_id, account_id=None):
     except User.DoesNotExist:
         logger.error(f"User {user_id} not found")
         raise
-    
-    except PortfolioSyncError as exc:
-        logger.error(f"Portfolio sync failed for user {user_id}: {str(exc)}")
-        # Retry the task
-        raise self.retry(exc=exc)
-    
-    except Exception as exc:
-        logger.error(
-            f"Unexpected error in sync task for user {user_id}: {str(exc)}",
-            exc_info=True
-        )
-        # Retry the task
-        raise self.retry(exc=exc)
+
+
+SNAPSHOT_BATCH_SIZE = 200
 
 
 @shared_task
@@ -86,16 +90,54 @@ def create_daily_snapshots():
     Create daily portfolio snapshots for all users.
     
     This task should be run once per day (e.g., at 11 PM).
+    Account IDs are streamed from MongoDB and dispatched in batches of
+    SNAPSHOT_BATCH_SIZE to create_snapshots_batch, so the orchestrator
+    never materializes every account at once.
     """
     logger.info("Starting daily snapshot creation")
     
-    # Get all active Robinhood accounts
-    accounts = RobinhoodAccount.objects.filter(is_active=True)
+    # Stream active account IDs without loading full documents
+    account_ids = RobinhoodAccount.objects(is_active=True).scalar('id').no_cache()
+    account_ids = (str(account_id) for account_id in account_ids)
+    
+    batches_queued = 0
+    accounts_queued = 0
     
+    while True:
+        batch = list(islice(account_ids, SNAPSHOT_BATCH_SIZE))
+        if not batch:
+            break
+        
+        create_snapshots_batch.delay(batch)
+        batches_queued += 1
+        accounts_queued += len(batch)
+    
+    logger.info(
+        f"Daily snapshots queued: {accounts_queued} accounts in {batches_queued} batches"
+    )
+    
+    return {
+        'batches_queued': batches_queued,
+        'accounts_queued': accounts_queued,
+        'completed_at': timezone.now().isoformat()
+    }
+
+
+@shared_task
+def create_snapshots_batch(account_ids):
+    """
+    Create daily snapshots for a batch of Robinhood accounts.
+    
+    Args:
+        account_ids: List of RobinhoodAccount IDs (as strings)
+        
+    Returns:
+        Dict with batch results
+    """
     snapshots_created = 0
     errors = 0
     
-    for account in accounts:
+    for account in RobinhoodAccount.objects(id__in=account_ids, is_active=True):
         try:
             # Get user
             user = User.objects.get(id=account.user_id)
@@ -118,7 +160,7 @@ def create_daily_snapshots():
             )
     
     logger.info(
-        f"Daily snapshots completed: {snapshots_created} created, {errors} errors"
+        f"Snapshot batch completed: {snapshots_created} created, {errors} errors"
     )
     
     return {
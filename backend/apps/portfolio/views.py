@@ -5,6 +5,11 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from celery.result import AsyncResult
+from django.utils import timezone
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
 import logging
 
 from .serializers import (
@@ -24,11 +29,101 @@ from .services.margin_calculation_service import MarginCalculationService
 from .services.pnl_calculation_service import PnLCalculationService
 from .services.top_movers_service import TopMoversService
 from .models import Portfolio, PortfolioSnapshot, Holding
-from apps.robinhood.client import RobinhoodClient
+from .tasks import sync_portfolio_task
+from .cache import cache_response
+from apps.robinhood.client import create_robinhood_client
+from apps.robinhood.models import RobinhoodAccount
 from core.exceptions import PortfolioSyncError
 
 logger = logging.getLogger('apps')
 
+# Lookback windows for fixed-length historical periods
+PERIOD_DELTAS = {
+    '1D': timedelta(days=1),
+    '1W': timedelta(days=7),
+    '1M': timedelta(days=30),
+    '1Y': timedelta(days=365),
+}
+
+# Ticker symbol URL segment, bounded by Holding.symbol's max_length so
+# over-long paths fail the route match early
+SYMBOL_URL_PATTERN = r'(?P<symbol>[^/.]{1,20})'
+
+# Expected exceptions mapped to (HTTP status, error code, log level)
+NO_ACCOUNT_ERRORS = {
+    ValueError: (status.HTTP_404_NOT_FOUND, 'NO_ACCOUNT', logging.WARNING),
+}
+SYNC_ERRORS = {
+    PortfolioSyncError: (status.HTTP_400_BAD_REQUEST, 'SYNC_ERROR', logging.ERROR),
+    **NO_ACCOUNT_ERRORS,
+}
+INVALID_PARAMETER_ERRORS = {
+    ValueError: (status.HTTP_400_BAD_REQUEST, 'INVALID_PARAMETER', logging.WARNING),
+}
+
+
+def error_response(code, message, http_status):
+    """Build the standard error envelope."""
+    return Response({
+        'success': False,
+        'error': {
+            'code': code,
+            'message': message
+        }
+    }, status=http_status)
+
+
+def api_endpoint(error_message, error_map=None):
+    """
+    Wrap a ViewSet action in the standard success/error envelope.
+    
+    The action returns its payload, which is sent as
+    ``{'success': True, 'data': payload}``; a Response returned by the
+    action (early 404s, 202s) is passed through unchanged. Exceptions in
+    ``error_map`` become error responses carrying the exception message,
+    anything else is logged and returned as a 500 with ``error_message``.
+    
+    Args:
+        error_message: Message for unexpected errors; formatted with the
+            action's URL kwargs (e.g. ``{symbol}``)
+        error_map: Dict of exception class -> (HTTP status, error code, log level)
+    """
+    error_map = error_map or {}
+    expected_errors = tuple(error_map)
+    
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(self, request, *args, **kwargs):
+            try:
+                result = view_method(self, request, *args, **kwargs)
+            
+            except expected_errors as e:
+                for error_class, (http_status, code, level) in error_map.items():
+                    if isinstance(e, error_class):
+                        break
+                logger.log(level, "%s error: %s", view_method.__name__, e)
+                return error_response(code, str(e), http_status)
+            
+            except Exception as e:
+                logger.error("%s error: %s", view_method.__name__, e, exc_info=True)
+                return error_response(
+                    'INTERNAL_ERROR',
+                    error_message.format(**kwargs),
+                    status.HTTP_500_INTERNAL_SERVER_ERROR
+                )
+            
+            if isinstance(result, Response):
+                return result
+            
+            return Response({
+                'success': True,
+                'data': result
+            })
+        
+        return wrapper
+    
+    return decorator
+
 
 class PortfolioViewSet(viewsets.ViewSet):
     """
@@ -44,7 +139,42 @@ class PortfolioViewSet(viewsets.ViewSet):
     
     permission_classes = [IsAuthenticated]
     
+    def _get_context(self, request):
+        """
+        Resolve the user's Robinhood account, portfolio and client.
+        
+        Memoized on the request so an endpoint only touches MongoDB
+        once for this bootstrap.
+        
+        Returns:
+            Tuple of (rh_account, portfolio, rh_client); all None if the
+            user has no linked Robinhood account
+        """
+        if not hasattr(request, '_portfolio_ctx'):
+            rh_account = RobinhoodAccount.get_user_accounts(request.user).first()
+            
+            if rh_account:
+                portfolio = Portfolio.get_or_create_for_user(
+                    user_id=request.user.id,
+                    account_id=rh_account.id
+                )
+                request._portfolio_ctx = (rh_account, portfolio, create_robinhood_client(rh_account))
+            else:
+                request._portfolio_ctx = (None, None, None)
+        
+        return request._portfolio_ctx
+    
+    def _no_account_response(self):
+        """Response for users without a linked Robinhood account."""
+        return error_response(
+            'NO_ACCOUNT',
+            'No Robinhood account found',
+            status.HTTP_404_NOT_FOUND
+        )
+    
     @action(detail=False, methods=['get'], url_path='summary')
+    @cache_response()
+    @api_endpoint('Failed to fetch portfolio summary', NO_ACCOUNT_ERRORS)
     def summary(self, request):
         """
         Get portfolio summary.
@@ -52,39 +182,13 @@ class PortfolioViewSet(viewsets.ViewSet):
         Returns:
             Portfolio summary with total value, P&L, and breakdowns
         """
-        try:
-            service = PortfolioService(request.user)
-            summary_data = service.get_portfolio_summary()
-            
-            serializer = PortfolioSerializer(data=summary_data)
-            serializer.is_valid(raise_exception=True)
-            
-            return Response({
-                'success': True,
-                'data': serializer.data
-            })
+        service = PortfolioService(request.user)
+        summary_data = service.get_portfolio_summary()
         
-        except ValueError as e:
-            logger.warning(f"Portfolio summary error: {str(e)}")
-            return Response({
-                'success': False,
-                'error': {
-                    'code': 'NO_ACCOUNT',
-                    'message': str(e)
-                }
-            }, status=status.HTTP_404_NOT_FOUND)
-        
-        except Exception as e:
-            logger.error(f"Portfolio summary error: {str(e)}", exc_info=True)
-            return Response({
-                'success': False,
-                'error': {
-                    'code': 'INTERNAL_ERROR',
-                    'message': 'Failed to fetch portfolio summary'
-                }
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        return PortfolioSerializer(summary_data).data
     
     @action(detail=False, methods=['get'], url_path='holdings')
+    @api_endpoint('Failed to fetch holdings', NO_ACCOUNT_ERRORS)
     def holdings(self, request):
         """
         Get all holdings.
@@ -92,84 +196,42 @@ class PortfolioViewSet(viewsets.ViewSet):
         Returns:
             List of all active holdings (stocks, options, crypto)
         """
-        try:
-            service = HoldingsService(request.user)
-            holdings_data = service.get_holdings()
-            
-            serializer = HoldingSerializer(data=holdings_data, many=True)
-            serializer.is_valid(raise_exception=True)
-            
-            return Response({
-                'success': True,
-                'data': {
-                    'holdings': serializer.data,
-                    'count': len(serializer.data)
-                }
-            })
+        service = HoldingsService(request.user)
+        holdings_data = service.get_holdings()
         
-        except ValueError as e:
-            logger.warning(f"Holdings error: {str(e)}")
-            return Response({
-                'success': False,
-                'error': {
-                    'code': 'NO_ACCOUNT',
-                    'message': str(e)
-                }
-            }, status=status.HTTP_404_NOT_FOUND)
+        serializer = HoldingSerializer(holdings_data, many=True)
         
-        except Exception as e:
-            logger.error(f"Holdings error: {str(e)}", exc_info=True)
-            return Response({
-                'success': False,
-                'error': {
-                    'code': 'INTERNAL_ERROR',
-                    'message': 'Failed to fetch holdings'
-                }
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        return {
+            'holdings': serializer.data,
+            'count': len(serializer.data)
+        }
     
-    @action(detail=False, methods=['get'], url_path='holdings/(?P<symbol>[^/.]+)')
+    @action(detail=False, methods=['get'], url_path=f'holdings/{SYMBOL_URL_PATTERN}')
+    @api_endpoint('Failed to fetch holding for {symbol}')
     def holding_detail(self, request, symbol=None):
         """
         Get specific holding by symbol.
         
         Args:
             symbol: Stock ticker symbol
-            
+        
         Returns:
             Holding details for the specified symbol
         """
-        try:
-            service = HoldingsService(request.user)
-            holding_data = service.get_holding_by_symbol(symbol)
-            
-            if not holding_data:
-                return Response({
-                    'success': False,
-                    'error': {
-                        'code': 'NOT_FOUND',
-                        'message': f'No holding found for symbol {symbol}'
-                    }
-                }, status=status.HTTP_404_NOT_FOUND)
-            
-            serializer = HoldingSerializer(data=holding_data)
-            serializer.is_valid(raise_exception=True)
-            
-            return Response({
-                'success': True,
-                'data': serializer.data
-            })
+        service = HoldingsService(request.user)
+        holding_data = service.get_holding_by_symbol(symbol)
         
-        except Exception as e:
-            logger.error(f"Holding detail error: {str(e)}", exc_info=True)
-            return Response({
-                'success': False,
-                'error': {
-                    'code': 'INTERNAL_ERROR',
-                    'message': f'Failed to fetch holding for {symbol}'
-                }
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        if not holding_data:
+            return error_response(
+                'NOT_FOUND',
+                f'No holding found for symbol {symbol}',
+                status.HTTP_404_NOT_FOUND
+            )
+        
+        return HoldingSerializer(holding_data).data
     
     @action(detail=False, methods=['post'], url_path='sync')
+    @api_endpoint('Failed to sync portfolio data', SYNC_ERRORS)
     def sync(self, request):
         """
         Sync portfolio data from Robinhood.
@@ -180,133 +242,114 @@ class PortfolioViewSet(viewsets.ViewSet):
         3. Update MongoDB
         4. Create snapshot
         
+        When ``background`` is true the sync is queued as a Celery task and
+        202 Accepted is returned with a task ID to poll via sync/status.
+        
         Returns:
             Sync status and updated portfolio data
         """
-        try:
-            # Validate request data
-            serializer = SyncPortfolioSerializer(data=request.data)
-            serializer.is_valid(raise_exception=True)
-            
-            # Initialize services
-            portfolio_service = PortfolioService(request.user)
-            holdings_service = HoldingsService(request.user)
-            
-            # Sync portfolio summary
-            logger.info(f"Starting portfolio sync for user {request.user.id}")
-            portfolio_result = portfolio_service.sync_portfolio_data()
-            
-            # Sync holdings
-            logger.info(f"Starting holdings sync for user {request.user.id}")
-            holdings_result = holdings_service.sync_holdings_data()
-            
-            # Combine results
-            response_data = {
-                'status': 'success',
-                'message': 'Portfolio synced successfully',
-                'synced_at': portfolio_result['synced_at'],
-                'portfolio': portfolio_result['portfolio'],
-                'holdings_created': holdings_result['holdings_created'],
-                'holdings_updated': holdings_result['holdings_updated'],
-                'total_holdings': holdings_result['total_holdings'],
-            }
-            
-            response_serializer = SyncResponseSerializer(data=response_data)
-            response_serializer.is_valid(raise_exception=True)
+        # Validate request data
+        serializer = SyncPortfolioSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        if serializer.validated_data['background']:
+            task = sync_portfolio_task.delay(request.user.id)
+            logger.info("Queued portfolio sync task %s for user %s", task.id, request.user.id)
             
             return Response({
                 'success': True,
-                'data': response_serializer.data
-            })
-        
-        except PortfolioSyncError as e:
-            logger.error(f"Portfolio sync error: {str(e)}")
-            return Response({
-                'success': False,
-                'error': {
-                    'code': 'SYNC_ERROR',
-                    'message': str(e)
+                'data': {
+                    'task_id': task.id,
+                    'status': 'queued'
                 }
-            }, status=status.HTTP_400_BAD_REQUEST)
+            }, status=status.HTTP_202_ACCEPTED)
         
-        except ValueError as e:
-            logger.warning(f"Sync validation error: {str(e)}")
-            return Response({
-                'success': False,
-                'error': {
-                    'code': 'NO_ACCOUNT',
-                    'message': str(e)
-                }
-            }, status=status.HTTP_404_NOT_FOUND)
+        # Initialize services
+        portfolio_service = PortfolioService(request.user)
+        holdings_service = HoldingsService(request.user)
         
-        except Exception as e:
-            logger.error(f"Sync error: {str(e)}", exc_info=True)
-            return Response({
-                'success': False,
-                'error': {
-                    'code': 'INTERNAL_ERROR',
-                    'message': 'Failed to sync portfolio data'
-                }
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        # Sync portfolio summary
+        logger.info("Starting portfolio sync for user %s", request.user.id)
+        portfolio_result = portfolio_service.sync_portfolio_data()
+        
+        # Sync holdings
+        logger.info("Starting holdings sync for user %s", request.user.id)
+        holdings_result = holdings_service.sync_holdings_data()
+        
+        # Combine results
+        response_data = {
+            'status': 'success',
+            'message': 'Portfolio synced successfully',
+            'synced_at': portfolio_result['synced_at'],
+            'portfolio': portfolio_result['portfolio'],
+            'holdings_created': holdings_result['holdings_created'],
+            'holdings_updated': holdings_result['holdings_updated'],
+            'total_holdings': holdings_result['total_holdings'],
+        }
+        
+        return SyncResponseSerializer(response_data).data
+    
+    @action(detail=False, methods=['get'], url_path='sync/status/(?P<task_id>[^/.]+)')
+    @api_endpoint('Failed to fetch sync status')
+    def sync_status(self, request, task_id=None):
+        """
+        Get the status of a background sync task.
+        
+        Args:
+            task_id: Celery task ID returned by sync
+        
+        Returns:
+            Task state, plus the sync result once it has succeeded
+        """
+        result = AsyncResult(task_id)
+        data = {
+            'task_id': task_id,
+            'status': result.state
+        }
+        
+        # Only expose results that belong to the requesting user
+        if result.successful() and isinstance(result.result, dict):
+            if result.result.get('user_id') == request.user.id:
+                data['result'] = result.result
+        
+        return data
     
     @action(detail=False, methods=['get'], url_path='performance')
+    @api_endpoint('Failed to fetch performance data', INVALID_PARAMETER_ERRORS)
     def performance(self, request):
         """
         Get historical portfolio performance.
         
         Query Parameters:
             days: Number of days to retrieve (default: 30)
-            
+        
         Returns:
             List of historical snapshots with performance data
         """
-        try:
-            days = int(request.query_params.get('days', 30))
-            
-            # Limit days to reasonable range
-            if days < 1:
-                days = 1
-            elif days > 365:
-                days = 365
-            
-            service = PortfolioService(request.user)
-            performance_data = service.get_historical_performance(days=days)
-            
-            serializer = PortfolioSnapshotSerializer(data=performance_data, many=True)
-            serializer.is_valid(raise_exception=True)
-            
-            return Response({
-                'success': True,
-                'data': {
-                    'snapshots': serializer.data,
-                    'count': len(serializer.data),
-                    'days': days
-                }
-            })
+        days = int(request.query_params.get('days', 30))
         
-        except ValueError as e:
-            logger.warning(f"Performance error: {str(e)}")
-            return Response({
-                'success': False,
-                'error': {
-                    'code': 'INVALID_PARAMETER',
-                    'message': str(e)
-                }
-            }, status=status.HTTP_400_BAD_REQUEST)
+        # Limit days to reasonable range
+        if days < 1:
+            days = 1
+        elif days > 365:
+            days = 365
         
-        except Exception as e:
-            logger.error(f"Performance error: {str(e)}", exc_info=True)
-            return Response({
-                'success': False,
-                'error': {
-                    'code': 'INTERNAL_ERROR',
-                    'message': 'Failed to fetch performance data'
-                }
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        service = PortfolioService(request.user)
+        performance_data = service.get_historical_performance(days=days)
+        
+        serializer = PortfolioSnapshotSerializer(performance_data, many=True)
+        
+        return {
+            'snapshots': serializer.data,
+            'count': len(serializer.data),
+            'days': days
+        }
     
     # NEW ENHANCED DASHBOARD ENDPOINTS
     
     @action(detail=False, methods=['get'], url_path='investment-overview')
+    @cache_response()
+    @api_endpoint('Failed to fetch investment overview')
     def investment_overview(self, request):
         """
         Get investment overview with margin and leverage metrics.
@@ -314,55 +357,26 @@ class PortfolioViewSet(viewsets.ViewSet):
         Returns:
             Investment metrics including cash invested, margin, and leverage
         """
-        try:
-            # Get portfolio and robinhood client
-            from apps.robinhood.models import RobinhoodAccount
-            
-            rh_account = RobinhoodAccount.get_user_accounts(request.user).first()
-            if not rh_account:
-                return Response({
-                    'success': False,
-                    'error': {
-                        'code': 'NO_ACCOUNT',
-                        'message': 'No Robinhood account found'
-                    }
-                }, status=status.HTTP_404_NOT_FOUND)
-            
-            portfolio = Portfolio.get_or_create_for_user(
-                user_id=request.user.id,
-                account_id=rh_account.id
-            )
-            
-            # Initialize services
-            rh_client = RobinhoodClient(rh_account)
-            # Session already exists from account linking - no need to re-authenticate
-            
-            margin_service = MarginCalculationService(request.user, rh_client)
-            
-            # Get margin overview
-            overview_data = margin_service.get_margin_overview(portfolio)
-            
-            # Don't logout - keep session active
-            
-            serializer = InvestmentOverviewSerializer(data=overview_data)
-            serializer.is_valid(raise_exception=True)
-            
-            return Response({
-                'success': True,
-                'data': serializer.data
-            })
+        # Get portfolio and robinhood client
+        rh_account, portfolio, rh_client = self._get_context(request)
+        if not rh_account:
+            return self._no_account_response()
         
-        except Exception as e:
-            logger.error(f"Investment overview error: {str(e)}", exc_info=True)
-            return Response({
-                'success': False,
-                'error': {
-                    'code': 'INTERNAL_ERROR',
-                    'message': 'Failed to fetch investment overview'
-                }
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        # Initialize services
+        # Session already exists from account linking - no need to re-authenticate
+        
+        margin_service = MarginCalculationService(request.user, rh_client)
+        
+        # Get margin overview
+        overview_data = margin_service.get_margin_overview(portfolio)
+        
+        # Don't logout - keep session active
+        
+        return InvestmentOverviewSerializer(overview_data).data
     
     @action(detail=False, methods=['get'], url_path='pnl-metrics')
+    @cache_response()
+    @api_endpoint('Failed to fetch P&L metrics')
     def pnl_metrics(self, request):
         """
         Get P&L metrics (Year-to-Date and today).
@@ -370,55 +384,26 @@ class PortfolioViewSet(viewsets.ViewSet):
         Returns:
             P&L metrics including YTD and today's performance
         """
-        try:
-            # Get portfolio and robinhood client
-            from apps.robinhood.models import RobinhoodAccount
-            
-            rh_account = RobinhoodAccount.get_user_accounts(request.user).first()
-            if not rh_account:
-                return Response({
-                    'success': False,
-                    'error': {
-                        'code': 'NO_ACCOUNT',
-                        'message': 'No Robinhood account found'
-                    }
-                }, status=status.HTTP_404_NOT_FOUND)
-            
-            portfolio = Portfolio.get_or_create_for_user(
-                user_id=request.user.id,
-                account_id=rh_account.id
-            )
-            
-            # Initialize services
-            rh_client = RobinhoodClient(rh_account)
-            # Session already exists from account linking - no need to re-authenticate
-            
-            pnl_service = PnLCalculationService(request.user, rh_client)
-            
-            # Get P&L overview
-            pnl_data = pnl_service.get_pnl_overview(portfolio)
-            
-            # Don't logout - keep session active
-            
-            serializer = PnLMetricsSerializer(data=pnl_data)
-            serializer.is_valid(raise_exception=True)
-            
-            return Response({
-                'success': True,
-                'data': serializer.data
-            })
+        # Get portfolio and robinhood client
+        rh_account, portfolio, rh_client = self._get_context(request)
+        if not rh_account:
+            return self._no_account_response()
         
-        except Exception as e:
-            logger.error(f"P&L metrics error: {str(e)}", exc_info=True)
-            return Response({
-                'success': False,
-                'error': {
-                    'code': 'INTERNAL_ERROR',
-                    'message': 'Failed to fetch P&L metrics'
-                }
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        # Initialize services
+        # Session already exists from account linking - no need to re-authenticate
+        
+        pnl_service = PnLCalculationService(request.user, rh_client)
+        
+        # Get P&L overview
+        pnl_data = pnl_service.get_pnl_overview(portfolio)
+        
+        # Don't logout - keep session active
+        
+        return PnLMetricsSerializer(pnl_data).data
     
     @action(detail=False, methods=['get'], url_path='holdings-analytics')
+    @cache_response()
+    @api_endpoint('Failed to fetch holdings analytics')
     def holdings_analytics(self, request):
         """
         Get holdings analytics including top movers and concentration.
@@ -426,134 +411,120 @@ class PortfolioViewSet(viewsets.ViewSet):
         Returns:
             Holdings analytics with top winners/losers and concentration risk
         """
-        try:
-            # Get portfolio and robinhood client
-            from apps.robinhood.models import RobinhoodAccount
-            
-            rh_account = RobinhoodAccount.get_user_accounts(request.user).first()
-            if not rh_account:
-                return Response({
-                    'success': False,
-                    'error': {
-                        'code': 'NO_ACCOUNT',
-                        'message': 'No Robinhood account found'
-                    }
-                }, status=status.HTTP_404_NOT_FOUND)
-            
-            portfolio = Portfolio.get_or_create_for_user(
-                user_id=request.user.id,
-                account_id=rh_account.id
-            )
-            
-            # Initialize services
-            rh_client = RobinhoodClient(rh_account)
-            # Session already exists from account linking - no need to re-authenticate
-            
-            top_movers_service = TopMoversService(request.user, rh_client)
-            
-            # Get complete analytics
-            analytics_data = top_movers_service.get_complete_analytics(portfolio)
-            
-            # Don't logout - keep session active
-            
-            serializer = HoldingsAnalyticsSerializer(data=analytics_data)
-            serializer.is_valid(raise_exception=True)
-            
-            return Response({
-                'success': True,
-                'data': serializer.data
-            })
+        # Get portfolio and robinhood client
+        rh_account, portfolio, rh_client = self._get_context(request)
+        if not rh_account:
+            return self._no_account_response()
         
-        except Exception as e:
-            logger.error(f"Holdings analytics error: {str(e)}", exc_info=True)
-            return Response({
-                'success': False,
-                'error': {
-                    'code': 'INTERNAL_ERROR',
-                    'message': 'Failed to fetch holdings analytics'
-                }
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        # Initialize services
+        # Session already exists from account linking - no need to re-authenticate
+        
+        top_movers_service = TopMoversService(request.user, rh_client)
+        
+        # Get complete analytics
+        analytics_data = top_movers_service.get_complete_analytics(portfolio)
+        
+        # Don't logout - keep session active
+        
+        return HoldingsAnalyticsSerializer(analytics_data).data
+    
+    @action(detail=False, methods=['get'], url_path='dashboard')
+    @cache_response()
+    @api_endpoint('Failed to fetch dashboard data')
+    def dashboard(self, request):
+        """
+        Get investment overview, P&L metrics and holdings analytics together.
+        
+        Each section makes its own Robinhood API calls, so they are computed
+        concurrently and latency is bounded by the slowest section rather
+        than the sum of all three.
+        
+        Returns:
+            Combined dashboard data keyed by section
+        """
+        rh_account, portfolio, rh_client = self._get_context(request)
+        if not rh_account:
+            return self._no_account_response()
+        
+        margin_service = MarginCalculationService(request.user, rh_client)
+        pnl_service = PnLCalculationService(request.user, rh_client)
+        top_movers_service = TopMoversService(request.user, rh_client)
+        
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            overview_future = executor.submit(margin_service.get_margin_overview, portfolio)
+            pnl_future = executor.submit(pnl_service.get_pnl_overview, portfolio)
+            analytics_future = executor.submit(top_movers_service.get_complete_analytics, portfolio)
+        
+        return {
+            'investment_overview': InvestmentOverviewSerializer(overview_future.result()).data,
+            'pnl_metrics': PnLMetricsSerializer(pnl_future.result()).data,
+            'holdings_analytics': HoldingsAnalyticsSerializer(analytics_future.result()).data
+        }
     
     @action(detail=False, methods=['get'], url_path='historical')
+    @api_endpoint('Failed to fetch historical data')
     def historical(self, request):
         """
         Get historical portfolio data for charts.
         
         Query Parameters:
             period: Time period (1D, 1W, 1M, 1Y, YTD, All) - default: 1M
-            
+        
         Returns:
             List of historical data points for chart
         """
-        try:
-            from datetime import datetime, timedelta
-            from django.utils import timezone
-            
-            period = request.query_params.get('period', '1M').upper()
-            
-            # Calculate date range based on period
-            now = timezone.now()
-            if period == '1D':
-                start_date = now - timedelta(days=1)
-            elif period == '1W':
-                start_date = now - timedelta(days=7)
-            elif period == '1M':
-                start_date = now - timedelta(days=30)
-            elif period == '1Y':
-                start_date = now - timedelta(days=365)
-            elif period == 'YTD':
-                start_date = datetime(now.year, 1, 1, tzinfo=now.tzinfo)
-            elif period == 'ALL':
-                start_date = None  # Get all data
-            else:
-                return Response({
-                    'success': False,
-                    'error': {
-                        'code': 'INVALID_PARAMETER',
-                        'message': f'Invalid period: {period}. Use 1D, 1W, 1M, 1Y, YTD, or All'
-                    }
-                }, status=status.HTTP_400_BAD_REQUEST)
-            
-            # Query snapshots
-            query = {'user_id': request.user.id}
-            if start_date:
-                query['timestamp__gte'] = start_date
-            
-            snapshots = PortfolioSnapshot.objects(**query).order_by('timestamp')
-            
-            # Format data for chart
-            historical_data = []
-            for snapshot in snapshots:
-                historical_data.append({
-                    'timestamp': snapshot.timestamp,
-                    'value': float(snapshot.total_value),
-                    'change': float(snapshot.daily_pl),
-                    'change_percent': float(snapshot.daily_pl_percent)
-                })
-            
-            serializer = HistoricalDataPointSerializer(data=historical_data, many=True)
-            serializer.is_valid(raise_exception=True)
-            
-            return Response({
-                'success': True,
-                'data': {
-                    'period': period,
-                    'data_points': serializer.data,
-                    'count': len(serializer.data)
-                }
-            })
+        period = request.query_params.get('period', '1M').upper()
         
-        except Exception as e:
-            logger.error(f"Historical data error: {str(e)}", exc_info=True)
-            return Response({
-                'success': False,
-                'error': {
-                    'code': 'INTERNAL_ERROR',
-                    'message': 'Failed to fetch historical data'
-                }
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        # Calculate date range based on period
+        now = timezone.now()
+        if period in PERIOD_DELTAS:
+            start_date = now - PERIOD_DELTAS[period]
+        elif period == 'YTD':
+            start_date = datetime(now.year, 1, 1, tzinfo=now.tzinfo)
+        elif period == 'ALL':
+            start_date = None  # Get all data
+        else:
+            return error_response(
+                'INVALID_PARAMETER',
+                f'Invalid period: {period}. Use 1D, 1W, 1M, 1Y, YTD, or All',
+                status.HTTP_400_BAD_REQUEST
+            )
+        
+        # Query snapshots
+        query = {'user_id': request.user.id}
+        if start_date:
+            query['timestamp__gte'] = start_date
+        
+        snapshots = list(
+            PortfolioSnapshot.objects(**query)
+            .only('timestamp', 'total_value', 'daily_pl', 'daily_pl_percent')
+            .order_by('timestamp')
+            .as_pymongo()
+        )
+        
+        # Format data for chart (DecimalFields are stored as BSON doubles,
+        # so raw values are already floats)
+        historical_data = [
+            {
+                'timestamp': snapshot['timestamp'],
+                'value': snapshot.get('total_value', 0.0),
+                'change': snapshot.get('daily_pl', 0.0),
+                'change_percent': snapshot.get('daily_pl_percent', 0.0)
+            }
+            for snapshot in snapshots
+        ]
+        
+        serializer = HistoricalDataPointSerializer(historical_data, many=True)
+        
+        return {
+            'period': period,
+            'data_points': serializer.data,
+            'count': len(serializer.data)
+        }
     
     @action(detail=False, methods=['get'], url_path='allocation')
+    @cache_response()
+    @api_endpoint('Failed to fetch allocation data')
     def allocation(self, request):
         """
         Get portfolio allocation data for pie chart.
@@ -561,64 +532,16 @@ class PortfolioViewSet(viewsets.ViewSet):
         Returns:
             List of holdings with allocation percentages
         """
-        try:
-            from apps.robinhood.models import RobinhoodAccount
-            
-            rh_account = RobinhoodAccount.get_user_accounts(request.user).first()
-            if not rh_account:
-                return Response({
-                    'success': False,
-                    'error': {
-                        'code': 'NO_ACCOUNT',
-                        'message': 'No Robinhood account found'
-                    }
-                }, status=status.HTTP_404_NOT_FOUND)
-            
-            portfolio = Portfolio.get_or_create_for_user(
-                user_id=request.user.id,
-                account_id=rh_account.id
-            )
-            
-            # Get all holdings
-            holdings = Holding.get_user_holdings(request.user.id, active_only=True)
-            
-            portfolio_value = float(portfolio.total_value)
-            
-            # Format allocation data
-            allocation_data = []
-            for holding in holdings:
-                market_value = float(holding.market_value)
-                allocation_percent = (market_value / portfolio_value * 100) if portfolio_value > 0 else 0
-                
-                allocation_data.append({
-                    'symbol': holding.symbol,
-                    'company_name': holding.company_name or holding.symbol,
-                    'asset_type': holding.asset_type,
-                    'market_value': market_value,
-                    'allocation_percent': allocation_percent,
-                    'quantity': float(holding.quantity)
-                })
-            
-            # Sort by allocation percentage (descending)
-            allocation_data.sort(key=lambda x: x['allocation_percent'], reverse=True)
-            
-            serializer = AllocationDataSerializer(data=allocation_data, many=True)
-            serializer.is_valid(raise_exception=True)
-            
-            return Response({
-                'success': True,
-                'data': {
-                    'allocations': serializer.data,
-                    'count': len(serializer.data)
-                }
-            })
+        rh_account = RobinhoodAccount.get_user_accounts(request.user, fields=('id',)).first()
+        if not rh_account:
+            return self._no_account_response()
         
-        except Exception as e:
-            logger.error(f"Allocation data error: {str(e)}", exc_info=True)
-            return Response({
-                'success': False,
-                'error': {
-                    'code': 'INTERNAL_ERROR',
-                    'message': 'Failed to fetch allocation data'
-                }
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        # Portfolio total, allocation percentages and sorting in one aggregation
+        allocation_data = Holding.get_allocation_data(request.user.id, rh_account.id)
+        
+        serializer = AllocationDataSerializer(allocation_data, many=True)
+        
+        return {
+            'allocations': serializer.data,
+            'count': len(serializer.data)
+        }
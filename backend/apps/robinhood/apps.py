@@ -2,9 +2,24 @@
 robinhood app configuration.
 """
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class RobinhoodConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.robinhood'
     verbose_name = 'Robinhood Integration'
+    
+    def ready(self):
+        """
+        Build the credential cipher at startup.
+        
+        A malformed ENCRYPTION_KEY then fails at boot instead of on the
+        first link or login. A missing key is left to production settings,
+        which already require it, so commands such as collectstatic still
+        run without one.
+        """
+        from core.encryption import get_encryption
+        
+        if settings.ENCRYPTION_KEY:
+            get_encryption()
@@ -0,0 +1,46 @@
+"""
+Response caching for Robinhood account read endpoints.
+Short-lived per-user caching of account list and detail data.
+"""
+from django.core.cache import cache
+
+ACCOUNT_CACHE_TIMEOUT = 60  # seconds
+
+
+def account_list_cache_key(user_id) -> str:
+    """Build the cache key for a user's account list."""
+    return f'robinhood_accounts_{user_id}'
+
+
+def account_detail_cache_key(user_id, account_id) -> str:
+    """Build the cache key for one of a user's accounts."""
+    return f'robinhood_account_{user_id}_{account_id}'
+
+
+def invalidate_account_cache(user_id, account_id=None):
+    """
+    Drop cached account data for a user.
+    
+    Args:
+        user_id: Owner of the account(s)
+        account_id: Also drop this account's detail entry
+    """
+    keys = [account_list_cache_key(user_id)]
+    if account_id:
+        keys.append(account_detail_cache_key(user_id, account_id))
+    cache.delete_many(keys)
+
+
+def invalidate_accounts_cache(accounts):
+    """
+    Drop cached list and detail data for several accounts at once.
+    
+    Args:
+        accounts: (user_id, account_id) pairs
+    """
+    keys = set()
+    for user_id, account_id in accounts:
+        keys.add(account_list_cache_key(user_id))
+        keys.add(account_detail_cache_key(user_id, account_id))
+    if keys:
+        cache.delete_many(list(keys))
@@ -19,14 +19,24 @@ Usage:
     
     # Clean up all non-superuser data
     python manage.py cleanup_robinhood_data --all-users
+    
+    # Soft-delete now and hard-delete in a Celery task
+    python manage.py cleanup_robinhood_data --async
 """
 from django.core.management.base import BaseCommand, CommandError
 from django.contrib.auth import get_user_model
 from apps.robinhood.models import RobinhoodAccount
+from apps.robinhood.tasks import purge_robinhood_accounts
 from apps.portfolio.models import Portfolio, Holding, PortfolioSnapshot
 
 User = get_user_model()
 
+# Accounts whose report lines are written to stdout in one call
+ACCOUNTS_PER_WRITE = 100
+
+# Inactive accounts fetched, reported and deleted together
+ACCOUNT_BATCH_SIZE = 500
+
 
 class Command(BaseCommand):
     help = 'Clean up orphaned Robinhood and portfolio data for non-superuser accounts'
@@ -52,12 +62,19 @@ class Command(BaseCommand):
             action='store_true',
             help='Only delete inactive/deactivated accounts and their data',
         )
+        parser.add_argument(
+            '--async',
+            action='store_true',
+            dest='run_async',
+            help='Soft-delete accounts now and hard-delete their data in a Celery task',
+        )
     
     def handle(self, *args, **options):
         dry_run = options['dry_run']
         user_id = options.get('user_id')
         all_users = options['all_users']
         inactive_only = options['inactive_only']
+        run_async = options['run_async']
         
         if dry_run:
             self.stdout.write(self.style.WARNING('DRY RUN MODE - No data will actually be deleted\n'))
@@ -68,10 +85,15 @@ class Command(BaseCommand):
             'portfolios': 0,
             'holdings': 0,
             'snapshots': 0,
-            'users_affected': set()
+            'users_affected': 0
         }
         
         try:
+            # Every query below filters on robinhood_account_id; make sure the
+            # declared indexes exist before scanning/deleting by it
+            for document in (Holding, PortfolioSnapshot, Portfolio):
+                document.ensure_indexes()
+            
             # Determine which accounts to clean
             if user_id:
                 # Clean specific user
@@ -80,60 +102,49 @@ class Command(BaseCommand):
                     raise CommandError(f'Cannot clean up data for superuser account (ID: {user_id})')
                 
                 self.stdout.write(f'Cleaning up data for user: {user.username} (ID: {user_id})\n')
-                self._cleanup_user_data(user_id, inactive_only, dry_run, summary)
+                self._cleanup_user_data(user_id, inactive_only, dry_run, summary, run_async)
             
             elif all_users:
                 # Clean all non-superuser accounts
                 self.stdout.write('Cleaning up data for all non-superuser accounts\n')
-                non_superusers = User.objects.filter(is_superuser=False)
+                non_superusers = User.objects.filter(is_superuser=False).only('id', 'username').iterator(chunk_size=1000)
                 
                 for user in non_superusers:
                     self.stdout.write(f'\nProcessing user: {user.username} (ID: {user.id})')
-                    self._cleanup_user_data(user.id, inactive_only, dry_run, summary)
+                    self._cleanup_user_data(user.id, inactive_only, dry_run, summary, run_async)
             
             else:
                 # Default: clean up inactive accounts only
                 self.stdout.write('Cleaning up inactive/deactivated Robinhood accounts\n')
-                inactive_accounts = RobinhoodAccount.objects(is_active=False)
+                # Superusers' accounts are filtered out by the query itself
+                superuser_ids = list(
+                    User.objects.filter(is_superuser=True).values_list('id', flat=True)
+                )
+                skipped_count = RobinhoodAccount.objects(
+                    is_active=False, user_id__in=superuser_ids
+                ).count()
+                if skipped_count:
+                    self.stdout.write(
+                        self.style.WARNING(f'  Skipping {skipped_count} superuser account(s)')
+                    )
+                
+                # Stream accounts with just the fields used below and clean
+                # them up a batch at a time, so only one batch is in memory
+                inactive_accounts = RobinhoodAccount.objects(
+                    is_active=False, user_id__nin=superuser_ids
+                ).only('id', 'user_id', 'account_number').no_cache().batch_size(ACCOUNT_BATCH_SIZE)
                 
+                # Every owner seen so far -> whether the user still exists
+                owners = {}
+                batch = []
                 for account in inactive_accounts:
-                    # Skip superuser accounts
-                    try:
-                        user = User.objects.get(id=account.user_id)
-                        if user.is_superuser:
-                            self.stdout.write(
-                                self.style.WARNING(f'  Skipping superuser account: {account.account_number}')
-                            )
-                            continue
-                    except User.DoesNotExist:
-                        self.stdout.write(
-                            self.style.WARNING(f'  User {account.user_id} not found for account {account.account_number}')
-                        )
-                    
-                    self.stdout.write(f'\n  Cleaning account: {account.account_number} (User ID: {account.user_id})')
-                    
-                    if not dry_run:
-                        deleted = account.delete_with_related_data()
-                        summary['accounts'] += deleted.get('account', 0)
-                        summary['portfolios'] += deleted.get('portfolio', 0)
-                        summary['holdings'] += deleted.get('holdings', 0)
-                        summary['snapshots'] += deleted.get('snapshots', 0)
-                        summary['users_affected'].add(account.user_id)
-                    else:
-                        # Preview mode
-                        holdings_count = Holding.objects(robinhood_account_id=account.id).count()
-                        snapshots_count = PortfolioSnapshot.objects(robinhood_account_id=account.id).count()
-                        portfolio_exists = Portfolio.objects(robinhood_account_id=account.id).first() is not None
-                        
-                        self.stdout.write(f'    - Holdings: {holdings_count}')
-                        self.stdout.write(f'    - Snapshots: {snapshots_count}')
-                        self.stdout.write(f'    - Portfolio: {"Yes" if portfolio_exists else "No"}')
-                        
-                        summary['accounts'] += 1
-                        summary['portfolios'] += 1 if portfolio_exists else 0
-                        summary['holdings'] += holdings_count
-                        summary['snapshots'] += snapshots_count
-                        summary['users_affected'].add(account.user_id)
+                    batch.append(account)
+                    if len(batch) == ACCOUNT_BATCH_SIZE:
+                        self._cleanup_inactive_batch(batch, owners, dry_run, summary, run_async)
+                        batch = []
+                
+                self._cleanup_inactive_batch(batch, owners, dry_run, summary, run_async)
+                summary['users_affected'] += len(owners)
             
             # Print summary
             self.stdout.write('\n' + '='*60)
@@ -142,7 +153,7 @@ class Command(BaseCommand):
             else:
                 self.stdout.write(self.style.SUCCESS('\nCLEANUP SUMMARY:'))
             
-            self.stdout.write(f'  Users affected: {len(summary["users_affected"])}')
+            self.stdout.write(f'  Users affected: {summary["users_affected"]}')
             self.stdout.write(f'  Accounts deleted: {summary["accounts"]}')
             self.stdout.write(f'  Portfolios deleted: {summary["portfolios"]}')
             self.stdout.write(f'  Holdings deleted: {summary["holdings"]}')
@@ -153,6 +164,10 @@ class Command(BaseCommand):
                 self.stdout.write(
                     self.style.WARNING('Run without --dry-run to actually delete the data')
                 )
+            elif run_async:
+                self.stdout.write(
+                    self.style.SUCCESS('Accounts marked for deletion; related data is being deleted in the background')
+                )
             else:
                 self.stdout.write(
                     self.style.SUCCESS('Cleanup completed successfully!')
@@ -163,48 +178,170 @@ class Command(BaseCommand):
         except Exception as e:
             raise CommandError(f'Error during cleanup: {str(e)}')
     
-    def _cleanup_user_data(self, user_id, inactive_only, dry_run, summary):
+    def _cleanup_user_data(self, user_id, inactive_only, dry_run, summary, run_async=False):
         """Clean up all Robinhood data for a specific user."""
         # Get user's accounts
         if inactive_only:
             accounts = RobinhoodAccount.objects(user_id=user_id, is_active=False)
         else:
             accounts = RobinhoodAccount.objects(user_id=user_id)
+        accounts = accounts.only('id', 'user_id', 'account_number', 'is_active')
         
         if not accounts:
             self.stdout.write(self.style.WARNING('  No accounts found'))
             return
         
+        account_ids = [account.id for account in accounts]
+        summary['users_affected'] += 1
+        if dry_run:
+            holdings_counts, snapshots_counts, portfolio_ids = self._preview_counts(account_ids)
+        
+        lines = []
         for account in accounts:
             status = 'inactive' if not account.is_active else 'active'
-            self.stdout.write(f'  Processing {status} account: {account.account_number}')
+            lines.append(f'  Processing {status} account: {account.account_number}')
             
-            if not dry_run:
-                deleted = account.delete_with_related_data()
-                summary['accounts'] += deleted.get('account', 0)
-                summary['portfolios'] += deleted.get('portfolio', 0)
-                summary['holdings'] += deleted.get('holdings', 0)
-                summary['snapshots'] += deleted.get('snapshots', 0)
-                summary['users_affected'].add(user_id)
+            if dry_run:
+                # Preview mode
+                holdings_count = holdings_counts.get(account.id, 0)
+                snapshots_count = snapshots_counts.get(account.id, 0)
+                portfolio_exists = account.id in portfolio_ids
                 
-                self.stdout.write(self.style.SUCCESS(
-                    f'    Deleted: {deleted["holdings"]} holdings, '
-                    f'{deleted["snapshots"]} snapshots, '
-                    f'{deleted["portfolio"]} portfolio'
+                lines.append(f'    Would delete:')
+                lines.append(f'      - Holdings: {holdings_count}')
+                lines.append(f'      - Snapshots: {snapshots_count}')
+                lines.append(f'      - Portfolio: {"Yes" if portfolio_exists else "No"}')
+                
+                summary['accounts'] += 1
+                summary['portfolios'] += 1 if portfolio_exists else 0
+                summary['holdings'] += holdings_count
+                summary['snapshots'] += snapshots_count
+        
+        self._write_lines(lines)
+        
+        if not dry_run:
+            # Delete all of the user's accounts together, one query per collection
+            deleted = self._delete_accounts(account_ids, run_async)
+            summary['accounts'] += deleted.get('account', 0)
+            summary['portfolios'] += deleted.get('portfolio', 0)
+            summary['holdings'] += deleted.get('holdings', 0)
+            summary['snapshots'] += deleted.get('snapshots', 0)
+            
+            self.stdout.write(self.style.SUCCESS(
+                f'    Deleted: {deleted["holdings"]} holdings, '
+                f'{deleted["snapshots"]} snapshots, '
+                f'{deleted["portfolio"]} portfolio(s), '
+                f'{deleted["account"]} account(s)'
+            ))
+    
+    def _cleanup_inactive_batch(self, accounts, owners, dry_run, summary, run_async):
+        """
+        Report and delete one batch of inactive accounts.
+        
+        ``owners`` maps every owner seen so far to whether the user still
+        exists; only owners new to this batch are looked up.
+        """
+        if not accounts:
+            return
+        
+        new_owner_ids = {account.user_id for account in accounts} - owners.keys()
+        if new_owner_ids:
+            known_user_ids = set(
+                User.objects.filter(id__in=new_owner_ids).values_list('id', flat=True)
+            )
+            owners.update((owner_id, owner_id in known_user_ids) for owner_id in new_owner_ids)
+        
+        account_ids = [account.id for account in accounts]
+        if dry_run:
+            holdings_counts, snapshots_counts, portfolio_ids = self._preview_counts(account_ids)
+        
+        lines = []
+        for index, account in enumerate(accounts, 1):
+            if not owners[account.user_id]:
+                lines.append(self.style.WARNING(
+                    f'  User {account.user_id} not found for account {account.account_number}'
                 ))
-            else:
+            
+            lines.append(f'\n  Cleaning account: {account.account_number} (User ID: {account.user_id})')
+            
+            if dry_run:
                 # Preview mode
-                holdings_count = Holding.objects(robinhood_account_id=account.id).count()
-                snapshots_count = PortfolioSnapshot.objects(robinhood_account_id=account.id).count()
-                portfolio_exists = Portfolio.objects(robinhood_account_id=account.id).first() is not None
+                holdings_count = holdings_counts.get(account.id, 0)
+                snapshots_count = snapshots_counts.get(account.id, 0)
+                portfolio_exists = account.id in portfolio_ids
                 
-                self.stdout.write(f'    Would delete:')
-                self.stdout.write(f'      - Holdings: {holdings_count}')
-                self.stdout.write(f'      - Snapshots: {snapshots_count}')
-                self.stdout.write(f'      - Portfolio: {"Yes" if portfolio_exists else "No"}')
+                lines.append(f'    - Holdings: {holdings_count}')
+                lines.append(f'    - Snapshots: {snapshots_count}')
+                lines.append(f'    - Portfolio: {"Yes" if portfolio_exists else "No"}')
                 
                 summary['accounts'] += 1
                 summary['portfolios'] += 1 if portfolio_exists else 0
                 summary['holdings'] += holdings_count
                 summary['snapshots'] += snapshots_count
-                summary['users_affected'].add(user_id)
+            
+            if index % ACCOUNTS_PER_WRITE == 0:
+                self._write_lines(lines)
+        
+        self._write_lines(lines)
+        
+        if not dry_run:
+            # One query per collection for the whole batch
+            deleted = self._delete_accounts(account_ids, run_async)
+            summary['accounts'] += deleted.get('account', 0)
+            summary['portfolios'] += deleted.get('portfolio', 0)
+            summary['holdings'] += deleted.get('holdings', 0)
+            summary['snapshots'] += deleted.get('snapshots', 0)
+    
+    def _write_lines(self, lines):
+        """Write buffered report lines to stdout in one call and clear the buffer."""
+        if lines:
+            self.stdout.write('\n'.join(lines))
+            lines.clear()
+    
+    def _delete_accounts(self, account_ids, run_async):
+        """
+        Delete accounts and their related data.
+        
+        With run_async the accounts are only soft-deleted here and a
+        Celery task performs the hard delete, so related-record counts
+        are not known and reported as 0.
+        """
+        if not run_async:
+            return RobinhoodAccount.bulk_delete_with_related(account_ids)
+        
+        marked = RobinhoodAccount.bulk_mark_for_deletion(account_ids)
+        purge_robinhood_accounts.delay([str(account_id) for account_id in account_ids])
+        
+        return {
+            'holdings': 0,
+            'snapshots': 0,
+            'portfolio': 0,
+            'account': marked
+        }
+    
+    def _preview_counts(self, account_ids):
+        """
+        Count what deleting the given accounts would remove.
+        
+        Runs one query per collection for all accounts rather than three
+        per account.
+        
+        Returns:
+            Tuple of ({account_id: holdings count}, {account_id: snapshots
+            count}, set of account IDs that have a portfolio)
+        """
+        if not account_ids:
+            return {}, {}, set()
+        
+        def count_by_account(document):
+            pipeline = [{'$group': {'_id': '$robinhood_account_id', 'count': {'$sum': 1}}}]
+            return {
+                row['_id']: row['count']
+                for row in document.objects(robinhood_account_id__in=account_ids).aggregate(pipeline)
+            }
+        
+        portfolio_ids = set(
+            Portfolio.objects(robinhood_account_id__in=account_ids).distinct('robinhood_account_id')
+        )
+        
+        return count_by_account(Holding), count_by_account(PortfolioSnapshot), portfolio_ids
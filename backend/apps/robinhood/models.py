@@ -2,15 +2,22 @@
 Robinhood Account models using MongoEngine.
 Stores encrypted Robinhood credentials and account metadata.
 """
+from bson import ObjectId
 from mongoengine import Document, fields, signals
+from pymongo.errors import DuplicateKeyError
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 import logging
 
+from .cache import invalidate_account_cache, invalidate_accounts_cache
+
 logger = logging.getLogger('apps')
 
 User = get_user_model()
 
+# Seconds after deleted_at before MongoDB removes a soft-deleted account
+DELETED_ACCOUNT_TTL = 30 * 24 * 60 * 60
+
 
 class RobinhoodAccount(Document):
     """
@@ -49,6 +56,7 @@ class RobinhoodAccount(Document):
     # Account Status
     is_active = fields.BooleanField(default=True)
     is_verified = fields.BooleanField(default=False)
+    deleted_at = fields.DateTimeField()  # Set when queued for hard deletion
     
     # Metadata
     created_at = fields.DateTimeField(default=timezone.now)
@@ -58,10 +66,19 @@ class RobinhoodAccount(Document):
     meta = {
         'collection': 'robinhood_accounts',
         'indexes': [
-            'user_id',
             'account_number',
-            {'fields': ['user_id', 'is_active']},
+            # Serves the per-user active-account lookups together with the
+            # default newest-first ordering, so no in-memory sort is needed;
+            # its prefixes cover user_id-only filters
+            {'fields': ['user_id', 'is_active', '-created_at']},
             '-created_at',
+            # Backstop for the purge sweep: MongoDB drops accounts left
+            # marked for deletion past the grace period on its own
+            {
+                'fields': ['deleted_at'],
+                'expireAfterSeconds': DELETED_ACCOUNT_TTL,
+                'partialFilterExpression': {'is_active': False},
+            },
         ],
         'ordering': ['-created_at']
     }
@@ -77,15 +94,63 @@ class RobinhoodAccount(Document):
         # Update timestamp
         self.updated_at = timezone.now()
     
-    def save(self, *args, **kwargs):
-        """Override save to ensure validation."""
-        self.clean()
-        return super().save(*args, **kwargs)
+    @classmethod
+    def get_user_accounts(cls, user, fields=None):
+        """
+        Get all active Robinhood accounts for a user.
+        
+        Args:
+            user: Django user
+            fields: Optional field names to load; leaves out the encrypted
+                credential and token blobs for callers that don't need them
+        """
+        accounts = cls.objects(user_id=user.id, is_active=True)
+        if fields:
+            accounts = accounts.only(*fields)
+        return accounts
     
     @classmethod
-    def get_user_accounts(cls, user):
-        """Get all active Robinhood accounts for a user."""
-        return cls.objects(user_id=user.id, is_active=True)
+    def get_or_create_active(cls, account_number, **values):
+        """
+        Get the active account with this number, creating it if absent.
+        
+        Done as one upsert so linking takes a single round trip. The new
+        document is built and validated locally and only written (via
+        $setOnInsert) if no active account matched, so an existing account
+        is returned unchanged.
+        
+        Args:
+            account_number: Robinhood account number
+            **values: Field values for a newly created account
+        
+        Returns:
+            Tuple of (account, created); created is False whenever a
+            document with this number already exists, including a
+            soft-deleted one that hasn't been purged yet
+        """
+        account = cls(id=ObjectId(), account_number=account_number, **values)
+        account.validate()
+        
+        try:
+            linked = cls.objects(account_number=account_number, is_active=True).modify(
+                upsert=True,
+                new=True,
+                __raw__={'$setOnInsert': account.to_mongo()}
+            )
+        except DuplicateKeyError:
+            # account_number is unique across the collection, so the insert
+            # loses to a concurrent link or to an inactive document still
+            # holding the number; report the existing document instead
+            existing = cls.objects(account_number=account_number).first()
+            if existing is None:
+                raise
+            return existing, False
+        
+        created = linked.id == account.id
+        if created:
+            invalidate_account_cache(linked.user_id)
+        
+        return linked, created
     
     @classmethod
     def get_account_by_number(cls, account_number):
@@ -93,14 +158,25 @@ class RobinhoodAccount(Document):
         return cls.objects(account_number=account_number).first()
     
     def update_sync_status(self, status, error=None):
-        """Update sync status and timestamp."""
+        """
+        Update sync status and timestamp.
+        
+        Written as a single atomic $set of the changed fields rather than
+        a full document save.
+        """
+        now = timezone.now()
         self.sync_status = status
-        self.last_sync = timezone.now()
-        if error:
-            self.sync_error = str(error)
-        else:
-            self.sync_error = None
-        self.save()
+        self.last_sync = now
+        self.sync_error = str(error) if error else None
+        self.updated_at = now
+        
+        type(self).objects(pk=self.pk).update_one(
+            set__sync_status=self.sync_status,
+            set__last_sync=self.last_sync,
+            set__sync_error=self.sync_error,
+            set__updated_at=self.updated_at
+        )
+        invalidate_account_cache(self.user_id, self.id)
         
         logger.info(
             f"Sync status updated for account {self.account_number}: {status}",
@@ -110,13 +186,104 @@ class RobinhoodAccount(Document):
     def deactivate(self):
         """Deactivate the account (soft delete)."""
         self.is_active = False
-        self.save()
+        self.updated_at = timezone.now()
+        
+        type(self).objects(pk=self.pk).update_one(
+            set__is_active=False,
+            set__updated_at=self.updated_at
+        )
+        invalidate_account_cache(self.user_id, self.id)
         
         logger.info(
             f"Robinhood account deactivated: {self.account_number}",
             extra={'user_id': self.user_id}
         )
     
+    @classmethod
+    def bulk_mark_for_deletion(cls, account_ids):
+        """
+        Soft-delete several accounts ahead of a background hard delete.
+        
+        Args:
+            account_ids: RobinhoodAccount IDs to mark
+        
+        Returns:
+            int: Number of accounts marked
+        """
+        if not account_ids:
+            return 0
+        
+        owners = cls._account_owners(account_ids)
+        
+        now = timezone.now()
+        marked = cls.objects(id__in=account_ids).update(
+            set__is_active=False,
+            set__deleted_at=now,
+            set__updated_at=now
+        )
+        invalidate_accounts_cache(owners)
+        
+        return marked
+    
+    @classmethod
+    def _account_owners(cls, account_ids):
+        """Get (user_id, account_id) pairs for accounts, for cache invalidation."""
+        return [
+            (account['user_id'], account['_id'])
+            for account in cls.objects(id__in=account_ids).only('id', 'user_id').as_pymongo()
+        ]
+    
+    @classmethod
+    def bulk_delete_with_related(cls, account_ids):
+        """
+        Delete several accounts and all their related data (hard delete).
+        
+        Issues one delete per collection for all accounts instead of
+        delete_with_related_data()'s per-account queries.
+        
+        Args:
+            account_ids: RobinhoodAccount IDs to delete
+        
+        Returns:
+            dict: Summary of deleted records, summed over all accounts
+        """
+        from apps.portfolio.models import Portfolio, Holding, PortfolioSnapshot
+        
+        deleted = {
+            'holdings': 0,
+            'snapshots': 0,
+            'portfolio': 0,
+            'account': 0
+        }
+        
+        if not account_ids:
+            return deleted
+        
+        owners = cls._account_owners(account_ids)
+        
+        try:
+            deleted['holdings'] = Holding.objects(robinhood_account_id__in=account_ids).delete()
+            deleted['snapshots'] = PortfolioSnapshot.objects(robinhood_account_id__in=account_ids).delete()
+            deleted['portfolio'] = Portfolio.objects(robinhood_account_id__in=account_ids).delete()
+            deleted['account'] = cls.objects(id__in=account_ids).delete()
+            invalidate_accounts_cache(owners)
+            
+            logger.info(
+                f"Bulk deleted {deleted['account']} Robinhood accounts and related data "
+                f"(Holdings: {deleted['holdings']}, Snapshots: {deleted['snapshots']}, "
+                f"Portfolios: {deleted['portfolio']})",
+                extra={'deleted_counts': deleted}
+            )
+            
+            return deleted
+        
+        except Exception as e:
+            logger.error(
+                f"Error bulk deleting {len(account_ids)} Robinhood accounts and related data: {str(e)}",
+                exc_info=True
+            )
+            raise
+    
     def delete_with_related_data(self):
         """
         Delete the account and all related data (hard delete).
@@ -145,25 +312,15 @@ class RobinhoodAccount(Document):
         }
         
         try:
-            # Delete all holdings
-            holdings_count = Holding.objects(robinhood_account_id=account_id).count()
-            Holding.objects(robinhood_account_id=account_id).delete()
-            deleted['holdings'] = holdings_count
-            
-            # Delete all portfolio snapshots
-            snapshots_count = PortfolioSnapshot.objects(robinhood_account_id=account_id).count()
-            PortfolioSnapshot.objects(robinhood_account_id=account_id).delete()
-            deleted['snapshots'] = snapshots_count
-            
-            # Delete portfolio
-            portfolio = Portfolio.objects(robinhood_account_id=account_id).first()
-            if portfolio:
-                portfolio.delete()
-                deleted['portfolio'] = 1
+            # One delete per collection; QuerySet.delete() returns the count
+            deleted['holdings'] = Holding.objects(robinhood_account_id=account_id).delete()
+            deleted['snapshots'] = PortfolioSnapshot.objects(robinhood_account_id=account_id).delete()
+            deleted['portfolio'] = Portfolio.objects(robinhood_account_id=account_id).delete()
             
             # Delete the account itself
             self.delete()
             deleted['account'] = 1
+            invalidate_account_cache(user_id, account_id)
             
             logger.info(
                 f"Robinhood account and related data deleted: {account_number} "
@@ -6,9 +6,35 @@ from rest_framework.exceptions import ValidationError
 from .models import RobinhoodAccount
 from core.encryption import encrypt_credentials
 import logging
+import re
 
 logger = logging.getLogger('apps')
 
+# Exactly six ASCII digits; covers the length checks as well
+MFA_CODE_PATTERN = re.compile(r'[0-9]{6}')
+
+
+# Document fields read by RobinhoodAccountSerializer, for query projections
+ACCOUNT_FIELDS = (
+    'id', 'user_id', 'account_number', 'account_type', 'mfa_enabled', 'mfa_type',
+    'last_sync', 'sync_status', 'sync_error', 'is_active', 'is_verified',
+    'created_at', 'updated_at',
+)
+
+
+def account_document_to_dict(document):
+    """
+    Build RobinhoodAccountSerializer's output from a raw account document.
+    
+    For list endpoints that read accounts with as_pymongo(), skipping
+    Document construction and per-instance serializer dispatch.
+    """
+    data = {'id': str(document['_id'])}
+    for field in ACCOUNT_FIELDS:
+        if field != 'id':
+            data[field] = document.get(field)
+    return data
+
 
 class RobinhoodAccountSerializer(serializers.Serializer):
     """
@@ -80,8 +106,6 @@ class LinkRobinhoodAccountSerializer(serializers.Serializer):
     mfa_code = serializers.CharField(
         required=False,
         allow_blank=True,
-        max_length=6,
-        min_length=6,
         help_text="6-digit 2FA code (required if MFA is enabled)"
     )
     mfa_type = serializers.ChoiceField(
@@ -90,11 +114,16 @@ class LinkRobinhoodAccountSerializer(serializers.Serializer):
         required=False,
         help_text="2FA delivery method"
     )
+    background = serializers.BooleanField(
+        default=False,
+        required=False,
+        help_text="Log in as a background task and return immediately"
+    )
     
     def validate_mfa_code(self, value):
         """Validate MFA code format."""
-        if value and not value.isdigit():
-            raise ValidationError("MFA code must be 6 digits")
+        if value and not MFA_CODE_PATTERN.fullmatch(value):
+            raise ValidationError("MFA code must be exactly 6 digits")
         return value
     
     def create(self, validated_data):
@@ -102,6 +131,8 @@ class LinkRobinhoodAccountSerializer(serializers.Serializer):
         Create a new RobinhoodAccount after validating credentials.
         
         This method is called from the view after Robinhood authentication succeeds.
+        If the account is already linked, the existing account is returned
+        and context['created'] is set to False.
         """
         user = self.context['request'].user
         username = validated_data['username']
@@ -118,17 +149,19 @@ class LinkRobinhoodAccountSerializer(serializers.Serializer):
         # Account number will be set by the view after successful authentication
         account_number = self.context.get('account_number', 'PENDING')
         
-        # Create RobinhoodAccount document
-        account = RobinhoodAccount(
+        # Create RobinhoodAccount document unless one is already linked
+        account, created = RobinhoodAccount.get_or_create_active(
+            account_number,
             user_id=user.id,
-            account_number=account_number,
             credentials_encrypted=credentials_encrypted,
             mfa_enabled=bool(validated_data.get('mfa_code')),
             mfa_type=mfa_type,
             is_verified=True,  # Verified through successful auth
         )
+        self.context['created'] = created
         
-        account.save()
+        if not created:
+            return account
         
         logger.info(
             f"Robinhood account linked: {account_number}",
@@ -144,13 +177,11 @@ class TestConnectionSerializer(serializers.Serializer):
     mfa_code = serializers.CharField(
         required=False,
         allow_blank=True,
-        max_length=6,
-        min_length=6,
         help_text="6-digit 2FA code"
     )
     
     def validate_mfa_code(self, value):
         """Validate MFA code format."""
-        if value and not value.isdigit():
-            raise ValidationError("MFA code must be 6 digits")
+        if value and not MFA_CODE_PATTERN.fullmatch(value):
+            raise ValidationError("MFA code must be exactly 6 digits")
         return value
@@ -0,0 +1,215 @@
+"""
+Celery tasks for Robinhood app.
+Background jobs for keeping Robinhood sessions fresh.
+"""
+from datetime import timedelta
+import random
+
+from celery import shared_task
+from celery.utils.log import get_task_logger
+from django.core.cache import cache
+from django.utils import timezone
+
+from .client import RobinhoodClient
+from .models import RobinhoodAccount
+from .serializers import RobinhoodAccountSerializer
+from core.encryption import decrypt_credentials
+from core.exceptions import MFARequiredError
+
+logger = get_task_logger(__name__)
+
+# Refresh tokens expiring within this window
+TOKEN_REFRESH_WINDOW = timedelta(minutes=30)
+
+# Spread refreshes over this many seconds so logins don't burst
+TOKEN_REFRESH_MAX_JITTER = 120
+
+
+def _refresh_failed_key(account_id) -> str:
+    """Cache key marking an account whose token refresh has failed."""
+    return f'rh_token_refresh_failed_{account_id}'
+
+
+@shared_task
+def refresh_expiring_robinhood_tokens():
+    """
+    Queue token refreshes for accounts whose session expires soon.
+    
+    Runs every few minutes from Celery beat so logins happen here rather
+    than inline on a user request. Each account is refreshed by its own
+    task with a random countdown to spread load on Robinhood.
+    
+    Only accounts that can log in without a challenge are refreshed: SMS/app
+    MFA accounts are skipped, and accounts whose refresh already failed for
+    the current token aren't retried on every run.
+    """
+    now = timezone.now()
+    
+    account_ids = [
+        str(account_id)
+        for account_id in RobinhoodAccount.objects(
+            is_active=True,
+            mfa_enabled=False,
+            token_expires_at__gt=now,
+            token_expires_at__lte=now + TOKEN_REFRESH_WINDOW
+        ).scalar('id').no_cache()
+    ]
+    failed = cache.get_many([_refresh_failed_key(account_id) for account_id in account_ids])
+    
+    accounts_queued = 0
+    for account_id in account_ids:
+        if _refresh_failed_key(account_id) in failed:
+            continue
+        
+        refresh_robinhood_token.apply_async(
+            args=[account_id],
+            countdown=random.uniform(0, TOKEN_REFRESH_MAX_JITTER)
+        )
+        accounts_queued += 1
+    
+    logger.info("Queued token refresh for %s Robinhood accounts", accounts_queued)
+    
+    return {
+        'accounts_queued': accounts_queued,
+        'completed_at': timezone.now().isoformat()
+    }
+
+
+@shared_task
+def refresh_robinhood_token(account_id):
+    """
+    Log in again with stored credentials to renew an account's token.
+    
+    The login is non-interactive: if Robinhood asks for verification the
+    refresh fails rather than sending the user a push or SMS. A failure is
+    recorded until the current token expires so the account isn't retried
+    (and challenged) on every beat run; the user's next interactive login
+    takes over.
+    
+    Args:
+        account_id: RobinhoodAccount ID (as string)
+    
+    Returns:
+        Dict with refresh result
+    """
+    account = RobinhoodAccount.objects(id=account_id, is_active=True, mfa_enabled=False).first()
+    if not account or cache.get(_refresh_failed_key(account_id)):
+        return {'status': 'skipped', 'account_id': account_id}
+    
+    try:
+        RobinhoodClient(account).authenticate(force_fresh_login=True, interactive=False)
+        logger.info("Refreshed Robinhood token for account %s", account_id)
+        return {'status': 'success', 'account_id': account_id}
+    
+    except Exception as e:
+        # The user's next interactive login remains the fallback
+        logger.warning("Failed to refresh Robinhood token for account %s: %s", account_id, e)
+        
+        expires_in = TOKEN_REFRESH_WINDOW.total_seconds()
+        if account.token_expires_at:
+            expires_in = (account.token_expires_at - timezone.now()).total_seconds()
+        cache.set(_refresh_failed_key(account_id), True, max(1, int(expires_in)))
+        
+        return {'status': 'failed', 'account_id': account_id}
+
+
+@shared_task
+def link_robinhood_account(user_id, credentials_encrypted, mfa_code=None, mfa_type='sms'):
+    """
+    Log in to Robinhood and link the account to a user.
+    
+    Queued by the link-account endpoint in background mode, so a login
+    that waits on Robinhood (or on MFA approval) doesn't hold a web worker.
+    Credentials arrive encrypted so no plaintext password goes through
+    the broker.
+    
+    Args:
+        user_id: User ID
+        credentials_encrypted: Encrypted username/password
+        mfa_code: Optional 2FA code
+        mfa_type: 2FA delivery method
+    
+    Returns:
+        Dict with link result; status is one of 'linked', 'already_linked',
+        'mfa_required' or 'failed'
+    """
+    result = {'user_id': user_id}
+    
+    try:
+        credentials = decrypt_credentials(credentials_encrypted)
+        
+        client = RobinhoodClient()
+        client.authenticate(
+            username=credentials['username'],
+            password=credentials['password'],
+            mfa_code=mfa_code
+        )
+        account_number = client.get_account_info().get('account_number', 'UNKNOWN')
+        
+        account, created = RobinhoodAccount.get_or_create_active(
+            account_number,
+            user_id=user_id,
+            credentials_encrypted=credentials_encrypted,
+            mfa_enabled=bool(mfa_code),
+            mfa_type=mfa_type,
+            is_verified=True,  # Verified through successful auth
+        )
+    
+    except MFARequiredError:
+        return {**result, 'status': 'mfa_required', 'mfa_type': mfa_type}
+    
+    except Exception as e:
+        logger.warning("Failed to link Robinhood account for user %s: %s", user_id, e)
+        return {**result, 'status': 'failed', 'error': str(e)}
+    
+    if not created:
+        return {**result, 'status': 'already_linked', 'account_number': account_number}
+    
+    logger.info("Linked Robinhood account %s for user %s", account_number, user_id)
+    
+    return {
+        **result,
+        'status': 'linked',
+        'account': RobinhoodAccountSerializer(account).data
+    }
+
+
+@shared_task
+def purge_robinhood_accounts(account_ids):
+    """
+    Hard-delete soft-deleted accounts and all their related data.
+    
+    Accounts no longer marked for deletion (e.g. restored since being
+    queued) are left alone.
+    
+    Args:
+        account_ids: RobinhoodAccount IDs (as strings)
+    
+    Returns:
+        Dict with deleted record counts
+    """
+    marked_ids = list(
+        RobinhoodAccount.objects(id__in=account_ids, deleted_at__ne=None).scalar('id')
+    )
+    deleted = RobinhoodAccount.bulk_delete_with_related(marked_ids)
+    
+    logger.info("Purged %s Robinhood accounts marked for deletion", deleted['account'])
+    
+    return {
+        'deleted': deleted,
+        'completed_at': timezone.now().isoformat()
+    }
+
+
+@shared_task
+def purge_deleted_robinhood_accounts():
+    """
+    Hard-delete every account marked for deletion.
+    
+    Periodic sweep for accounts whose purge task was lost or failed.
+    """
+    marked_ids = [
+        str(account_id)
+        for account_id in RobinhoodAccount.objects(deleted_at__ne=None).scalar('id')
+    ]
+    return purge_robinhood_accounts(marked_ids)
@@ -5,25 +5,31 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from celery.result import AsyncResult
+from django.core.cache import cache
 from django.utils import timezone
 import logging
 
+from .cache import ACCOUNT_CACHE_TIMEOUT, account_detail_cache_key, account_list_cache_key
 from .models import RobinhoodAccount
 from .serializers import (
+    ACCOUNT_FIELDS,
+    account_document_to_dict,
     RobinhoodAccountSerializer,
     LinkRobinhoodAccountSerializer,
     TestConnectionSerializer
 )
 from .client import RobinhoodClient
-from core.exceptions import (
-    RobinhoodAPIError,
-    MFARequiredError,
-    CredentialDecryptionError
-)
+from .tasks import link_robinhood_account
+from core.encryption import encrypt_credentials
 
 logger = logging.getLogger('apps')
 security_logger = logging.getLogger('security')
 
+# Seconds a queued background link may wait for a worker before it is
+# dropped; the user will have retried by then
+LINK_TASK_EXPIRES = 120
+
 
 class RobinhoodAccountViewSet(viewsets.GenericViewSet):
     """
@@ -34,6 +40,10 @@ class RobinhoodAccountViewSet(viewsets.GenericViewSet):
     - Listing linked accounts
     - Testing connections
     - Unlinking accounts
+    
+    Robinhood, MFA and credential errors propagate to
+    core.exceptions.custom_exception_handler, which maps them to the
+    standard error envelope.
     """
     
     serializer_class = RobinhoodAccountSerializer
@@ -53,9 +63,14 @@ class RobinhoodAccountViewSet(viewsets.GenericViewSet):
             "username": "your-robinhood-email@example.com",
             "password": "your-robinhood-password",
             "mfa_code": "123456",  // Required if 2FA is enabled
-            "mfa_type": "sms"      // or "app"
+            "mfa_type": "sms",     // or "app"
+            "background": false    // Optional
         }
         
+        When ``background`` is true the login runs as a Celery task and
+        202 Accepted is returned with a task ID to poll via
+        link-account/status.
+        
         Returns:
             Account details if successful
             MFA requirement if 2FA code needed
@@ -80,119 +95,124 @@ class RobinhoodAccountViewSet(viewsets.GenericViewSet):
         password = serializer.validated_data['password']
         mfa_code = serializer.validated_data.get('mfa_code')
         
-        try:
-            # Attempt authentication with Robinhood
-            client = RobinhoodClient()
-            auth_result = client.authenticate(
-                username=username,
-                password=password,
-                mfa_code=mfa_code
+        if serializer.validated_data['background']:
+            task = link_robinhood_account.apply_async(
+                args=[
+                    request.user.id,
+                    encrypt_credentials(username, password),
+                    mfa_code,
+                    serializer.validated_data.get('mfa_type', 'sms')
+                ],
+                expires=LINK_TASK_EXPIRES
             )
-            
-            # Get account information
-            account_info = client.get_account_info()
-            account_number = account_info.get('account_number', 'UNKNOWN')
-            
-            # Don't logout - keep session active for subsequent API calls
-            # Robin-stocks will handle session caching automatically
-            
-            # Check if account already linked (only check active accounts)
-            existing = RobinhoodAccount.objects(
-                account_number=account_number,
-                is_active=True
-            ).first()
-            
-            if existing and existing.user_id == request.user.id:
-                return Response({
-                    'success': False,
-                    'error': {
-                        'code': 'RES_002',
-                        'message': 'This Robinhood account is already linked',
-                        'details': {'account_number': account_number}
-                    }
-                }, status=status.HTTP_409_CONFLICT)
-            
-            # Create account
-            serializer.context['account_number'] = account_number
-            account = serializer.save()
-            
-            # Log successful linking
-            security_logger.info(
-                f"Robinhood account linked: {account_number}",
-                extra={'user_id': request.user.id, 'account_id': str(account.id)}
+            logger.info(
+                "Queued Robinhood account link task %s",
+                task.id,
+                extra={'user_id': request.user.id}
             )
             
             return Response({
                 'success': True,
                 'data': {
-                    'account': RobinhoodAccountSerializer(account).data,
-                    'message': 'Robinhood account linked successfully'
+                    'task_id': task.id,
+                    'status': 'queued'
                 }
-            }, status=status.HTTP_201_CREATED)
+            }, status=status.HTTP_202_ACCEPTED)
         
-        except MFARequiredError as e:
-            security_logger.warning(
-                f"MFA required for account linking: {username}",
-                extra={'user_id': request.user.id}
-            )
-            
-            return Response({
-                'success': False,
-                'error': {
-                    'code': 'AUTH_004',
-                    'message': '2FA code is required',
-                    'details': {
-                        'mfa_required': True,
-                        'mfa_type': request.data.get('mfa_type', 'sms')
-                    }
-                }
-            }, status=status.HTTP_400_BAD_REQUEST)
+        # Attempt authentication with Robinhood
+        client = RobinhoodClient()
+        auth_result = client.authenticate(
+            username=username,
+            password=password,
+            mfa_code=mfa_code
+        )
         
-        except RobinhoodAPIError as e:
-            logger.error(
-                f"Robinhood API error during linking: {str(e)}",
-                extra={'user_id': request.user.id}
-            )
-            
-            return Response({
-                'success': False,
-                'error': {
-                    'code': 'SYNC_003',
-                    'message': 'Failed to connect to Robinhood',
-                    'details': {'error': str(e)}
-                }
-            }, status=status.HTTP_400_BAD_REQUEST)
+        # Get account information
+        account_info = client.get_account_info()
+        account_number = account_info.get('account_number', 'UNKNOWN')
         
-        except Exception as e:
-            logger.error(
-                f"Unexpected error during account linking: {str(e)}",
-                exc_info=True,
-                extra={'user_id': request.user.id}
-            )
-            
+        # Don't logout - keep session active for subsequent API calls
+        # Robin-stocks will handle session caching automatically
+        
+        # Create account, unless an active one is already linked
+        serializer.context['account_number'] = account_number
+        account = serializer.save()
+        
+        if not serializer.context['created']:
             return Response({
                 'success': False,
                 'error': {
-                    'code': 'INTERNAL_ERROR',
-                    'message': 'An unexpected error occurred',
-                    'details': {'error': str(e)}
+                    'code': 'RES_002',
+                    'message': 'This Robinhood account is already linked',
+                    'details': {'account_number': account_number}
                 }
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            }, status=status.HTTP_409_CONFLICT)
+        
+        # Log successful linking
+        security_logger.info(
+            "Robinhood account linked: %s",
+            account_number,
+            extra={'user_id': request.user.id, 'account_id': str(account.id)}
+        )
+        
+        return Response({
+            'success': True,
+            'data': {
+                'account': RobinhoodAccountSerializer(account).data,
+                'message': 'Robinhood account linked successfully'
+            }
+        }, status=status.HTTP_201_CREATED)
+    
+    @action(detail=False, methods=['get'], url_path='link-account/status/(?P<task_id>[^/.]+)')
+    def link_account_status(self, request, task_id=None):
+        """
+        Get the status of a background account link.
+        
+        GET /api/v1/robinhood/link-account/status/:task_id/
+        
+        Returns:
+            Task state, plus the link result once the task has finished
+        """
+        result = AsyncResult(task_id)
+        data = {
+            'task_id': task_id,
+            'status': result.state
+        }
+        
+        # Only expose results that belong to the requesting user
+        if result.successful() and isinstance(result.result, dict):
+            if result.result.get('user_id') == request.user.id:
+                data['result'] = result.result
+        
+        return Response({
+            'success': True,
+            'data': data
+        })
     
     def list(self, request):
         """
         List all linked Robinhood accounts for current user.
         
         GET /api/v1/robinhood/accounts/
+        
+        Cached briefly per user; linking, syncing and unlinking clear it.
         """
-        accounts = self.get_queryset()
-        serializer = RobinhoodAccountSerializer(accounts, many=True)
+        accounts = cache.get_or_set(
+            account_list_cache_key(request.user.id),
+            lambda: [
+                account_document_to_dict(document)
+                for document in RobinhoodAccount.get_user_accounts(
+                    request.user, fields=ACCOUNT_FIELDS
+                ).as_pymongo()
+            ],
+            ACCOUNT_CACHE_TIMEOUT
+        )
         
         return Response({
             'success': True,
             'data': {
-                'accounts': serializer.data,
-                'count': len(serializer.data)
+                'accounts': accounts,
+                'count': len(accounts)
             }
         })
     
@@ -201,37 +221,38 @@ class RobinhoodAccountViewSet(viewsets.GenericViewSet):
         Get details of a specific Robinhood account.
         
         GET /api/v1/robinhood/accounts/:id/
+        
+        Cached briefly per user and account, like list().
         """
-        try:
-            account = RobinhoodAccount.objects(id=pk, user_id=request.user.id).first()
-            
-            if not account:
-                return Response({
-                    'success': False,
-                    'error': {
-                        'code': 'RES_001',
-                        'message': 'Account not found',
-                        'details': {}
-                    }
-                }, status=status.HTTP_404_NOT_FOUND)
-            
-            serializer = RobinhoodAccountSerializer(account)
-            
+        cache_key = account_detail_cache_key(request.user.id, pk)
+        account_data = cache.get(cache_key)
+        if account_data is not None:
             return Response({
                 'success': True,
-                'data': serializer.data
+                'data': account_data
             })
         
-        except Exception as e:
-            logger.error(f"Error retrieving account: {str(e)}", exc_info=True)
+        account = RobinhoodAccount.objects(
+            id=pk, user_id=request.user.id
+        ).only(*ACCOUNT_FIELDS).first()
+        
+        if not account:
             return Response({
                 'success': False,
                 'error': {
-                    'code': 'INTERNAL_ERROR',
-                    'message': 'Failed to retrieve account',
-                    'details': {'error': str(e)}
+                    'code': 'RES_001',
+                    'message': 'Account not found',
+                    'details': {}
                 }
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        account_data = RobinhoodAccountSerializer(account).data
+        cache.set(cache_key, account_data, ACCOUNT_CACHE_TIMEOUT)
+        
+        return Response({
+            'success': True,
+            'data': account_data
+        })
     
     def destroy(self, request, pk=None):
         """
@@ -245,48 +266,40 @@ class RobinhoodAccountViewSet(viewsets.GenericViewSet):
         - All portfolio snapshots
         - Portfolio data
         """
-        try:
-            account = RobinhoodAccount.objects(id=pk, user_id=request.user.id).first()
-            
-            if not account:
-                return Response({
-                    'success': False,
-                    'error': {
-                        'code': 'RES_001',
-                        'message': 'Account not found',
-                        'details': {}
-                    }
-                }, status=status.HTTP_404_NOT_FOUND)
-            
-            # Delete account and all related data (hard delete)
-            deleted_counts = account.delete_with_related_data()
-            
-            security_logger.info(
-                f"Robinhood account deleted by user {request.user.id}",
-                extra={
-                    'user_id': request.user.id,
-                    'deleted_counts': deleted_counts
-                }
-            )
-            
-            return Response({
-                'success': True,
-                'data': {
-                    'message': 'Robinhood account and all related data unlinked successfully',
-                    'deleted': deleted_counts
-                }
-            }, status=status.HTTP_200_OK)
+        # Only what unlinking reads; credentials and tokens aren't needed
+        account = RobinhoodAccount.objects(
+            id=pk, user_id=request.user.id
+        ).only('id', 'user_id', 'account_number').first()
         
-        except Exception as e:
-            logger.error(f"Error unlinking account: {str(e)}", exc_info=True)
+        if not account:
             return Response({
                 'success': False,
                 'error': {
-                    'code': 'INTERNAL_ERROR',
-                    'message': 'Failed to unlink account',
-                    'details': {'error': str(e)}
+                    'code': 'RES_001',
+                    'message': 'Account not found',
+                    'details': {}
                 }
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        # Delete account and all related data (hard delete)
+        deleted_counts = account.delete_with_related_data()
+        
+        security_logger.info(
+            "Robinhood account deleted by user %s",
+            request.user.id,
+            extra={
+                'user_id': request.user.id,
+                'deleted_counts': deleted_counts
+            }
+        )
+        
+        return Response({
+            'success': True,
+            'data': {
+                'message': 'Robinhood account and all related data unlinked successfully',
+                'deleted': deleted_counts
+            }
+        }, status=status.HTTP_200_OK)
     
     @action(detail=True, methods=['post'], url_path='test-connection')
     def test_connection(self, request, pk=None):
@@ -298,79 +311,57 @@ class RobinhoodAccountViewSet(viewsets.GenericViewSet):
             "mfa_code": "123456"  // Required if 2FA enabled
         }
         """
-        try:
-            account = RobinhoodAccount.objects(id=pk, user_id=request.user.id).first()
-            
-            if not account:
-                return Response({
-                    'success': False,
-                    'error': {
-                        'code': 'RES_001',
-                        'message': 'Account not found',
-                        'details': {}
-                    }
-                }, status=status.HTTP_404_NOT_FOUND)
-            
-            serializer = TestConnectionSerializer(data=request.data)
-            if not serializer.is_valid():
-                return Response({
-                    'success': False,
-                    'error': {
-                        'code': 'VAL_001',
-                        'message': 'Validation failed',
-                        'details': serializer.errors
-                    }
-                }, status=status.HTTP_400_BAD_REQUEST)
-            
-            mfa_code = serializer.validated_data.get('mfa_code')
-            
-            # Test connection
-            client = RobinhoodClient(account)
-            connection_valid = client.test_connection(mfa_code=mfa_code)
-            
-            if connection_valid:
-                account.update_sync_status('success')
-                
-                return Response({
-                    'success': True,
-                    'data': {
-                        'connection_valid': True,
-                        'message': 'Connection test successful',
-                        'tested_at': timezone.now()
-                    }
-                })
-            else:
-                account.update_sync_status('failed', 'Connection test failed')
-                
-                return Response({
-                    'success': False,
-                    'error': {
-                        'code': 'SYNC_002',
-                        'message': 'Connection test failed',
-                        'details': {
-                            'connection_valid': False,
-                            'suggestion': 'Check credentials or provide MFA code'
-                        }
-                    }
-                }, status=status.HTTP_400_BAD_REQUEST)
+        account = RobinhoodAccount.objects(id=pk, user_id=request.user.id).first()
         
-        except MFARequiredError:
+        if not account:
             return Response({
                 'success': False,
                 'error': {
-                    'code': 'AUTH_004',
-                    'message': '2FA code is required',
-                    'details': {'mfa_required': True}
+                    'code': 'RES_001',
+                    'message': 'Account not found',
+                    'details': {}
+                }
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        serializer = TestConnectionSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response({
+                'success': False,
+                'error': {
+                    'code': 'VAL_001',
+                    'message': 'Validation failed',
+                    'details': serializer.errors
                 }
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        except Exception as e:
-            logger.error(f"Connection test error: {str(e)}", exc_info=True)
+        mfa_code = serializer.validated_data.get('mfa_code')
+        
+        # Test connection
+        client = RobinhoodClient(account)
+        connection_valid = client.test_connection(mfa_code=mfa_code)
+        
+        if connection_valid:
+            account.update_sync_status('success')
+            
+            return Response({
+                'success': True,
+                'data': {
+                    'connection_valid': True,
+                    'message': 'Connection test successful',
+                    'tested_at': timezone.now()
+                }
+            })
+        else:
+            account.update_sync_status('failed', 'Connection test failed')
+            
             return Response({
                 'success': False,
                 'error': {
-                    'code': 'INTERNAL_ERROR',
+                    'code': 'SYNC_002',
                     'message': 'Connection test failed',
-                    'details': {'error': str(e)}
+                    'details': {
+                        'connection_valid': False,
+                        'suggestion': 'Check credentials or provide MFA code'
+                    }
                 }
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            }, status=status.HTTP_400_BAD_REQUEST)
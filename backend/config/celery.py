@@ -26,6 +26,7 @@ app.conf.beat_schedule = {
         'schedule': crontab(hour=23, minute=0),  # 11 PM daily
         'options': {
             'expires': 3600,  # Task expires after 1 hour
+            'priority': 9,  # Behind user-triggered syncs (0 is highest on Redis)
         }
     },
     'cleanup-old-manual-snapshots': {
@@ -35,6 +36,20 @@ app.conf.beat_schedule = {
             'expires': 3600,
         }
     },
+    'purge-deleted-robinhood-accounts': {
+        'task': 'apps.robinhood.tasks.purge_deleted_robinhood_accounts',
+        'schedule': crontab(hour=3, minute=0),  # 3 AM daily
+        'options': {
+            'expires': 3600,
+        }
+    },
+    'refresh-expiring-robinhood-tokens': {
+        'task': 'apps.robinhood.tasks.refresh_expiring_robinhood_tokens',
+        'schedule': crontab(minute='*/5'),  # Every 5 minutes
+        'options': {
+            'expires': 300,
+        }
+    },
 }
 
 # Celery configuration
@@ -47,6 +62,17 @@ app.conf.update(
     task_track_started=True,
     task_time_limit=30 * 60,  # 30 minutes
     task_soft_time_limit=25 * 60,  # 25 minutes
+    result_expires=60 * 60,  # Drop task results from Redis after 1 hour
+    # Reserve one task at a time so long snapshot runs don't hold short
+    # tasks hostage, and only ack once a task has finished
+    worker_prefetch_multiplier=1,
+    task_acks_late=True,
+    worker_max_tasks_per_child=200,  # Recycle workers to reclaim leaked memory
+    broker_transport_options={
+        'visibility_timeout': 60 * 60,  # Longer than task_time_limit
+        'priority_steps': [0, 5, 9],
+        'queue_order_strategy': 'priority',
+    },
 )
 
 
@@ -38,6 +38,7 @@ INSTALLED_APPS = [
     'django_celery_beat',
     
     # Local apps
+    'core',
     'apps.authentication',
     'apps.portfolio',
     'apps.transactions',
@@ -56,6 +57,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.log_context.RequestLogContextMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
@@ -149,7 +151,7 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 25,
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'core.renderers.ORJSONRenderer',
     ],
     'DEFAULT_PARSER_CLASSES': [
         'rest_framework.parsers.JSONParser',
@@ -244,6 +246,11 @@ SESSION_CACHE_ALIAS = 'default'
 # Encryption Configuration
 ENCRYPTION_KEY = os.environ.get('ENCRYPTION_KEY', '')
 
+# Robinhood Configuration
+# Use the access token embedded in an approved verification workflow
+# response instead of repeating the login request
+ROBINHOOD_USE_WORKFLOW_TOKEN = os.environ.get('ROBINHOOD_USE_WORKFLOW_TOKEN', 'False') == 'True'
+
 # Application Settings
 APP_NAME = os.environ.get('APP_NAME', 'Portfolio Performance Tracker')
 APP_URL = os.environ.get('APP_URL', 'http://localhost:8000')
@@ -269,6 +276,9 @@ LOGGING = {
         'require_debug_true': {
             'class': 'django.utils.log.RequireDebugTrue',
         },
+        'request_context': {
+            '()': 'core.log_context.RequestContextFilter',
+        },
     },
     'handlers': {
         'console': {
@@ -307,11 +317,13 @@ LOGGING = {
         'security': {
             'handlers': ['console', 'security_file'],
             'level': 'WARNING',
+            'filters': ['request_context'],
             'propagate': False,
         },
         'apps': {
             'handlers': ['console', 'file'],
             'level': 'DEBUG',
+            'filters': ['request_context'],
             'propagate': False,
         },
     },
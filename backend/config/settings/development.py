@@ -50,7 +50,7 @@ LOGGING['loggers']['django']['level'] = 'DEBUG'
 
 # DRF - Add browsable API renderer in development
 REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = [
-    'rest_framework.renderers.JSONRenderer',
+    'core.renderers.ORJSONRenderer',
     'rest_framework.renderers.BrowsableAPIRenderer',  # For easy API testing
 ]
 
@@ -60,9 +60,13 @@ LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
     'formatters': {
-        'verbose': {
-            'format': '{levelname} {asctime} {module} {process:d} {thread:d} {message}',
-            'style': '{',
+        'json': {
+            '()': 'core.log_context.JSONFormatter',
+        },
+    },
+    'filters': {
+        'request_context': {
+            '()': 'core.log_context.RequestContextFilter',
         },
     },
     'handlers': {
@@ -72,7 +76,7 @@ LOGGING = {
             'filename': BASE_DIR / 'logs' / 'django.log',
             'maxBytes': 1024 * 1024 * 10,  # 10 MB
             'backupCount': 10,
-            'formatter': 'verbose',
+            'formatter': 'json',
         },
         'error_file': {
             'level': 'ERROR',
@@ -80,7 +84,7 @@ LOGGING = {
             'filename': BASE_DIR / 'logs' / 'error.log',
             'maxBytes': 1024 * 1024 * 10,  # 10 MB
             'backupCount': 10,
-            'formatter': 'verbose',
+            'formatter': 'json',
         },
         'security_file': {
             'level': 'WARNING',
@@ -88,7 +92,7 @@ LOGGING = {
             'filename': BASE_DIR / 'logs' / 'security.log',
             'maxBytes': 1024 * 1024 * 10,  # 10 MB
             'backupCount': 10,
-            'formatter': 'verbose',
+            'formatter': 'json',
         },
     },
     'loggers': {
@@ -105,11 +109,13 @@ LOGGING = {
         'security': {
             'handlers': ['security_file'],
             'level': 'WARNING',
+            'filters': ['request_context'],
             'propagate': False,
         },
         'apps': {
             'handlers': ['file', 'error_file'],
             'level': 'INFO',
+            'filters': ['request_context'],
             'propagate': False,
         },
     },
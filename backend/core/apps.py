@@ -0,0 +1,18 @@
+"""
+core app configuration.
+"""
+from django.apps import AppConfig
+
+# Loggers written to on the request path (views, exception handler)
+QUEUED_LOGGERS = ('apps', 'security')
+
+
+class CoreConfig(AppConfig):
+    name = 'core'
+    verbose_name = 'Core'
+    
+    def ready(self):
+        """Move request-path log handlers onto background threads."""
+        from .log_queue import start_queue_logging
+        
+        start_queue_logging(QUEUED_LOGGERS)
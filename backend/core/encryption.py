@@ -2,11 +2,18 @@
 Encryption utilities for securely storing Robinhood credentials.
 Uses Fernet (symmetric encryption) with AES-256.
 """
-import json
-from typing import Dict
+from functools import lru_cache
+from typing import Any, Dict
+import orjson
 from cryptography.fernet import Fernet
 from django.conf import settings
 
+# Joins the per-field ciphertexts; never occurs in a (base64) Fernet token
+FIELD_SEPARATOR = '\x00'
+
+# Credential fields, in the order their ciphertexts are stored
+CREDENTIAL_FIELDS = ('username', 'password')
+
 
 class CredentialEncryption:
     """
@@ -30,12 +37,15 @@ class CredentialEncryption:
         """
         Encrypt credentials dictionary to a string.
         
+        Each field is encrypted into its own Fernet token and the tokens are
+        joined with FIELD_SEPARATOR, so no JSON is involved.
+        
         Args:
             credentials: Dictionary containing 'username' and 'password'
                         Example: {'username': 'user@example.com', 'password': 'pass123'}
         
         Returns:
-            Base64 encoded encrypted string
+            Separator-joined Fernet tokens
         
         Raises:
             ValueError: If credentials dict is invalid
@@ -48,14 +58,10 @@ class CredentialEncryption:
             raise ValueError("Credentials must contain 'username' and 'password' keys")
         
         try:
-            # Convert to JSON string
-            json_data = json.dumps(credentials)
-            
-            # Encrypt
-            encrypted = self.cipher.encrypt(json_data.encode())
-            
-            # Return as string
-            return encrypted.decode()
+            return FIELD_SEPARATOR.join(
+                self.cipher.encrypt(credentials[field].encode()).decode()
+                for field in CREDENTIAL_FIELDS
+            )
         
         except Exception as e:
             raise Exception(f"Encryption failed: {str(e)}")
@@ -64,8 +70,11 @@ class CredentialEncryption:
         """
         Decrypt credentials string back to dictionary.
         
+        Accepts both the per-field format and the legacy single token
+        holding a JSON object.
+        
         Args:
-            encrypted_data: Base64 encoded encrypted string
+            encrypted_data: Encrypted credentials string
         
         Returns:
             Dictionary containing 'username' and 'password'
@@ -77,16 +86,20 @@ class CredentialEncryption:
             raise ValueError("Encrypted data cannot be empty")
         
         try:
-            # Decrypt
-            decrypted = self.cipher.decrypt(encrypted_data.encode())
+            if not is_legacy_payload(encrypted_data):
+                tokens = encrypted_data.split(FIELD_SEPARATOR)
+                if len(tokens) != len(CREDENTIAL_FIELDS):
+                    raise ValueError("Decrypted data missing required keys")
+                
+                return {
+                    field: self.cipher.decrypt(token.encode()).decode()
+                    for field, token in zip(CREDENTIAL_FIELDS, tokens)
+                }
             
-            # Parse JSON
-            credentials = json.loads(decrypted.decode())
+            # Legacy format: one token over a JSON object
+            credentials = self.decrypt_data(encrypted_data)
             
             # Validate structure
-            if not isinstance(credentials, dict):
-                raise ValueError("Decrypted data is not a valid dictionary")
-            
             if 'username' not in credentials or 'password' not in credentials:
                 raise ValueError("Decrypted data missing required keys")
             
@@ -94,6 +107,58 @@ class CredentialEncryption:
         
         except Exception as e:
             raise Exception(f"Decryption failed: {str(e)}")
+    
+    def encrypt_data(self, data: Dict[str, Any]) -> str:
+        """
+        Encrypt an arbitrary JSON-serializable dictionary (e.g. OAuth tokens).
+        
+        Args:
+            data: Dictionary to encrypt
+        
+        Returns:
+            Fernet token over the orjson-encoded dictionary
+        """
+        return self.cipher.encrypt(orjson.dumps(data)).decode()
+    
+    def decrypt_data(self, encrypted_data: str) -> Dict[str, Any]:
+        """
+        Decrypt a dictionary encrypted with encrypt_data().
+        
+        Args:
+            encrypted_data: Fernet token string
+        
+        Returns:
+            Decrypted dictionary
+        
+        Raises:
+            ValueError: If the payload is not a JSON object
+        """
+        data = orjson.loads(self.cipher.decrypt(encrypted_data.encode()))
+        if not isinstance(data, dict):
+            raise ValueError("Decrypted data is not a valid dictionary")
+        return data
+
+
+def is_legacy_payload(encrypted_data: str) -> bool:
+    """
+    Check whether encrypted data uses the legacy JSON format.
+    
+    Legacy payloads should be re-encrypted once they have been decrypted
+    successfully, so later reads skip JSON parsing.
+    """
+    return FIELD_SEPARATOR not in encrypted_data
+
+
+@lru_cache(maxsize=1)
+def get_encryption() -> CredentialEncryption:
+    """
+    Get the process-wide CredentialEncryption instance.
+    
+    Built on first use (so importing this module doesn't require
+    ENCRYPTION_KEY) and reused afterwards, so the Fernet cipher and its
+    keys are set up once per process instead of on every call.
+    """
+    return CredentialEncryption()
 
 
 def encrypt_credentials(username: str, password: str) -> str:
@@ -107,8 +172,7 @@ def encrypt_credentials(username: str, password: str) -> str:
     Returns:
         Encrypted credentials string
     """
-    encryption = CredentialEncryption()
-    return encryption.encrypt({
+    return get_encryption().encrypt({
         'username': username,
         'password': password
     })
@@ -124,8 +188,33 @@ def decrypt_credentials(encrypted_data: str) -> Dict[str, str]:
     Returns:
         Dictionary with 'username' and 'password'
     """
-    encryption = CredentialEncryption()
-    return encryption.decrypt(encrypted_data)
+    return get_encryption().decrypt(encrypted_data)
+
+
+def encrypt_token(token_data: Dict[str, Any]) -> str:
+    """
+    Helper function to encrypt an OAuth token dictionary.
+    
+    Args:
+        token_data: Token fields (access_token, token_type, ...)
+    
+    Returns:
+        Encrypted token string
+    """
+    return get_encryption().encrypt_data(token_data)
+
+
+def decrypt_token(encrypted_data: str) -> Dict[str, Any]:
+    """
+    Helper function to decrypt an OAuth token dictionary.
+    
+    Args:
+        encrypted_data: Encrypted token string
+    
+    Returns:
+        Token dictionary
+    """
+    return get_encryption().decrypt_data(encrypted_data)
 
 
 def generate_encryption_key() -> str:
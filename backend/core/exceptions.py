@@ -4,11 +4,57 @@ Custom exception handlers and exceptions for Portfolio Performance Tracker.
 from rest_framework.views import exception_handler
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.exceptions import (
+    AuthenticationFailed,
+    MethodNotAllowed,
+    NotAuthenticated,
+    NotFound,
+    ParseError,
+    PermissionDenied,
+    Throttled,
+    ValidationError,
+)
 import logging
 
 logger = logging.getLogger('apps')
 security_logger = logging.getLogger('security')
 
+# Error codes by exception class; get_error_code() adds subclasses as it
+# resolves them so each class's MRO is only walked once
+ERROR_CODES = {
+    NotAuthenticated: 'AUTH_001',
+    AuthenticationFailed: 'AUTH_001',
+    PermissionDenied: 'AUTH_003',
+    NotFound: 'RES_001',
+    ValidationError: 'VAL_001',
+    ParseError: 'VAL_002',
+    MethodNotAllowed: 'REQ_001',
+    Throttled: 'RATE_LIMIT',
+}
+
+# Where log_exception() sends each error as (logger, level, message):
+# specific status codes first, then by status class (status_code // 100)
+LOG_TARGETS = {
+    401: (security_logger, logging.WARNING, "Auth error: %s"),
+    403: (security_logger, logging.WARNING, "Auth error: %s"),
+}
+LOG_TARGETS_BY_CLASS = {
+    4: (logger, logging.WARNING, "Client error: %s"),
+    5: (logger, logging.ERROR, "Server error: %s"),
+}
+
+
+def error_envelope(code, message, details) -> dict:
+    """Build the standard error response body."""
+    return {
+        'success': False,
+        'error': {
+            'code': code,
+            'message': message,
+            'details': details
+        }
+    }
+
 
 def custom_exception_handler(exc, context):
     """
@@ -23,107 +69,155 @@ def custom_exception_handler(exc, context):
             "details": {...}
         }
     }
+    
+    Domain exceptions listed in DOMAIN_ERRORS are mapped here too, so
+    views can let them propagate instead of catching them.
     """
+    domain_error = get_domain_error(exc)
+    if domain_error is not None:
+        http_status, code, message = domain_error
+        log_exception(exc, context, http_status)
+        return Response(
+            error_envelope(code, message, get_domain_error_details(exc, context)),
+            status=http_status
+        )
+    
     # Call DRF's default exception handler first
     response = exception_handler(exc, context)
     
     if response is not None:
         # Customize the response format
-        custom_response_data = {
-            'success': False,
-            'error': {
-                'code': get_error_code(exc),
-                'message': get_error_message(exc, response.data),
-                'details': response.data if isinstance(response.data, dict) else {'detail': response.data}
-            }
-        }
-        
-        response.data = custom_response_data
+        data = response.data
+        response.data = error_envelope(
+            get_error_code(exc),
+            get_error_message(exc, data),
+            data if isinstance(data, dict) else {'detail': data}
+        )
         
         # Log the error
         log_exception(exc, context, response.status_code)
     
     else:
         # Handle non-DRF exceptions
-        custom_response_data = {
-            'success': False,
-            'error': {
-                'code': 'INTERNAL_ERROR',
-                'message': 'An internal server error occurred.',
-                'details': {'detail': str(exc)}
-            }
-        }
-        
         response = Response(
-            custom_response_data,
+            error_envelope(
+                'INTERNAL_ERROR',
+                'An internal server error occurred.',
+                {'detail': str(exc)}
+            ),
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
         
-        # Log the exception
+        # Log the exception; only names and IDs go on the record so it
+        # doesn't keep the view and request alive in the log queue
+        view = context.get('view')
+        request = context.get('request')
         logger.error(
-            f"Unhandled exception: {exc}",
+            "Unhandled exception: %s",
+            exc,
             exc_info=True,
-            extra={'context': context}
+            extra={
+                'view': type(view).__name__ if view else 'Unknown',
+                'user_id': getattr(getattr(request, 'user', None), 'id', None),
+            }
         )
     
     return response
 
 
+def get_domain_error(exc):
+    """
+    Look up the DOMAIN_ERRORS entry for an exception, or None.
+    
+    Exact classes are a single dict lookup; subclasses fall back to an
+    MRO walk.
+    """
+    exc_class = type(exc)
+    domain_error = DOMAIN_ERRORS.get(exc_class)
+    if domain_error is None:
+        domain_error = next(
+            (DOMAIN_ERRORS[cls] for cls in exc_class.__mro__ if cls in DOMAIN_ERRORS),
+            None
+        )
+    
+    return domain_error
+
+
+def get_domain_error_details(exc, context) -> dict:
+    """Build the error details for a domain exception."""
+    if isinstance(exc, MFARequiredError):
+        request = context.get('request')
+        return {
+            'mfa_required': True,
+            'mfa_type': request.data.get('mfa_type', 'sms') if request else 'sms'
+        }
+    
+    return {'error': str(exc)}
+
+
 def get_error_code(exc) -> str:
-    """Get appropriate error code based on exception type."""
-    exc_class = exc.__class__.__name__
-    
-    error_code_map = {
-        'NotAuthenticated': 'AUTH_001',
-        'AuthenticationFailed': 'AUTH_001',
-        'PermissionDenied': 'AUTH_003',
-        'NotFound': 'RES_001',
-        'ValidationError': 'VAL_001',
-        'ParseError': 'VAL_002',
-        'MethodNotAllowed': 'REQ_001',
-        'Throttled': 'RATE_LIMIT',
-    }
+    """
+    Get appropriate error code based on exception type.
     
-    return error_code_map.get(exc_class, 'UNKNOWN_ERROR')
+    Subclasses of the mapped DRF exceptions get their parent's code.
+    """
+    exc_class = type(exc)
+    code = ERROR_CODES.get(exc_class)
+    if code is None:
+        code = next(
+            (ERROR_CODES[cls] for cls in exc_class.__mro__ if cls in ERROR_CODES),
+            'UNKNOWN_ERROR'
+        )
+        ERROR_CODES[exc_class] = code
+    
+    return code
 
 
 def get_error_message(exc, response_data) -> str:
     """Extract human-readable error message from exception."""
-    if hasattr(exc, 'detail'):
-        if isinstance(exc.detail, str):
-            return exc.detail
-        elif isinstance(exc.detail, dict):
-            # Get first error message
-            for key, value in exc.detail.items():
-                if isinstance(value, list) and value:
-                    return f"{key}: {value[0]}"
-                return f"{key}: {value}"
+    detail = getattr(exc, 'detail', None)
+    
+    # ErrorDetail subclasses str, so this can't be an exact type check
+    if isinstance(detail, str):
+        return detail
+    
+    if isinstance(detail, dict) and detail:
+        # Get first error message
+        key, value = next(iter(detail.items()))
+        if isinstance(value, list) and value:
+            value = value[0]
+        return f"{key}: {value}"
     
     return str(exc)
 
 
 def log_exception(exc, context, status_code):
-    """Log exceptions for monitoring and debugging."""
+    """
+    Log exceptions for monitoring and debugging.
+    
+    Nothing is built when the target logger would drop the record. The
+    user is logged by ID so the user object is never stringified.
+    """
+    log_target = LOG_TARGETS.get(status_code) or LOG_TARGETS_BY_CLASS.get(status_code // 100)
+    if log_target is None:
+        return
+    
+    target, level, message = log_target
+    if not target.isEnabledFor(level):
+        return
+    
     view = context.get('view')
     request = context.get('request')
     
+    # Path and method are added by RequestContextFilter
     log_data = {
-        'exception': exc.__class__.__name__,
+        'exception': type(exc).__name__,
         'status_code': status_code,
-        'view': view.__class__.__name__ if view else 'Unknown',
-        'path': request.path if request else 'Unknown',
-        'method': request.method if request else 'Unknown',
-        'user': str(request.user) if request and hasattr(request, 'user') else 'Anonymous',
+        'view': type(view).__name__ if view else 'Unknown',
+        'user_id': getattr(getattr(request, 'user', None), 'id', None),
     }
     
-    # Log based on status code
-    if status_code >= 500:
-        logger.error(f"Server error: {exc}", extra=log_data, exc_info=True)
-    elif status_code >= 400:
-        if status_code == 401 or status_code == 403:
-            security_logger.warning(f"Auth error: {exc}", extra=log_data)
-        else:
-            logger.warning(f"Client error: {exc}", extra=log_data)
+    target.log(level, message, exc, extra=log_data, exc_info=status_code >= 500)
 
 
 # Custom Exceptions
@@ -151,3 +245,16 @@ class MFARequiredError(Exception):
 class PortfolioSyncError(Exception):
     """Raised when portfolio data synchronization fails."""
     pass
+
+
+# Domain exceptions handled by custom_exception_handler, mapped to
+# (HTTP status, error code, message)
+DOMAIN_ERRORS = {
+    MFARequiredError: (status.HTTP_400_BAD_REQUEST, 'AUTH_004', '2FA code is required'),
+    CredentialDecryptionError: (
+        status.HTTP_500_INTERNAL_SERVER_ERROR,
+        'INTERNAL_ERROR',
+        'Failed to decrypt stored credentials'
+    ),
+    RobinhoodAPIError: (status.HTTP_400_BAD_REQUEST, 'SYNC_003', 'Failed to connect to Robinhood'),
+}
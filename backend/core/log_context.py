@@ -0,0 +1,85 @@
+"""
+Structured logging support.
+Binds request context once per request and renders records as JSON.
+"""
+import contextvars
+import logging
+
+import orjson
+
+# Fields bound for the current request, added to every record logged
+# while it is handled
+_request_context = contextvars.ContextVar('log_request_context', default=None)
+
+# Attributes every LogRecord has; anything else on a record came from extra=
+_RECORD_ATTRIBUTES = frozenset(
+    logging.LogRecord('', 0, '', 0, '', (), None).__dict__
+) | {'message', 'asctime'}
+
+
+class RequestLogContextMiddleware:
+    """
+    Bind the request's path and method for log records.
+    
+    Log calls made while handling the request then don't need to pass
+    them in extra= themselves.
+    """
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+    
+    def __call__(self, request):
+        token = _request_context.set({
+            'path': request.path,
+            'method': request.method,
+        })
+        try:
+            return self.get_response(request)
+        finally:
+            _request_context.reset(token)
+
+
+class RequestContextFilter(logging.Filter):
+    """
+    Copy the bound request context onto log records.
+    
+    Attach to loggers rather than handlers: handlers may run on a queue
+    listener thread, where the request's context isn't visible. Values
+    passed explicitly via extra= win.
+    """
+    
+    def filter(self, record):
+        context = _request_context.get()
+        if context:
+            for key, value in context.items():
+                if key not in record.__dict__:
+                    setattr(record, key, value)
+        return True
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    Render log records as one JSON object per line.
+    
+    Extra fields are emitted as top-level keys so aggregators don't have
+    to parse them back out of the message.
+    """
+    
+    def format(self, record):
+        data = {
+            'timestamp': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data['exc_info'] = record.exc_text
+        
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                data[key] = value
+        
+        return orjson.dumps(data, default=str).decode()
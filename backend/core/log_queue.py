@@ -0,0 +1,97 @@
+"""
+Queue-based logging for request paths.
+Moves handler I/O for selected loggers onto background listener threads.
+"""
+import atexit
+import copy
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+# (queue handler, listener) pairs started by start_queue_logging()
+_listeners = []
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler that leaves all formatting to the listener's handlers.
+    
+    The stdlib prepare() formats the record, traceback included, on the
+    calling thread and folds the traceback into the message. Here the
+    record is only copied with its message arguments merged (so they
+    can't change before the listener runs), and exc_info reaches the real
+    handlers and formatters intact.
+    """
+    
+    def prepare(self, record):
+        """Copy the record with its arguments merged into the message."""
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def _start_listener(logger: logging.Logger):
+    """Put a logger's handlers behind its own queue and listener thread."""
+    handlers = list(logger.handlers)
+    if not handlers:
+        return
+    
+    log_queue = queue.SimpleQueue()
+    queue_handler = DeferredQueueHandler(log_queue)
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    
+    logger.handlers = [queue_handler]
+    listener.start()
+    _listeners.append((queue_handler, listener))
+
+
+def _restart_listeners():
+    """
+    Restart listener threads in a forked child.
+    
+    Threads don't survive fork (Celery prefork workers, gunicorn with
+    preload), so each child gets fresh queues and threads; the parent's
+    queues may have been copied mid-operation.
+    """
+    for index, (queue_handler, listener) in enumerate(_listeners):
+        log_queue = queue.SimpleQueue()
+        queue_handler.queue = log_queue
+        
+        # The parent's listener holds a thread that isn't running here
+        listener = QueueListener(
+            log_queue,
+            *listener.handlers,
+            respect_handler_level=listener.respect_handler_level
+        )
+        listener.start()
+        _listeners[index] = (queue_handler, listener)
+
+
+def _stop_listeners():
+    """Flush queued records and stop listener threads at exit."""
+    for _, listener in _listeners:
+        listener.stop()
+
+
+def start_queue_logging(logger_names):
+    """
+    Route the named loggers through QueueHandlers.
+    
+    Each logger keeps its configured handlers (and their levels), but they
+    run on a listener thread, so the calling thread only enqueues the
+    record. Each logger gets its own listener so records never reach
+    another logger's handlers. Safe to call more than once.
+    
+    Args:
+        logger_names: Names of loggers to switch over
+    """
+    if _listeners:
+        return
+    
+    for name in logger_names:
+        _start_listener(logging.getLogger(name))
+    
+    atexit.register(_stop_listeners)
+    os.register_at_fork(after_in_child=_restart_listeners)
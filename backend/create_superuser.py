@@ -7,6 +7,7 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.development')
 django.setup()
 
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
 
 User = get_user_model()
 
@@ -16,5 +17,13 @@ password = '***'
 if User.objects.filter(email=email).exists():
     print(f'✅ Superuser with email {email} already exists.')
 else:
-    User.objects.create_superuser(email=email, password=password)
-    print(f'✅ Superuser created successfully with email: {email}')
+    # Another process (e.g. a second init container) may create the user
+    # between the check and the insert; the unique email constraint
+    # rejects the duplicate
+    try:
+        with transaction.atomic():
+            User.objects.create_superuser(email=email, password=password)
+    except IntegrityError:
+        print(f'✅ Superuser with email {email} already exists.')
+    else:
+        print(f'✅ Superuser created successfully with email: {email}')
@@ -5,8 +5,11 @@ Run this to test the portfolio sync with your real Robinhood account.
 Usage:
     python test_portfolio_sync.py
 """
+import logging
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+
 import django
 
 # Setup Django
@@ -14,12 +17,15 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.development')
 django.setup()
 
 from django.contrib.auth import get_user_model
+from apps.robinhood.client import create_robinhood_client
 from apps.robinhood.models import RobinhoodAccount
 from apps.portfolio.services import PortfolioService, HoldingsService
 from apps.portfolio.models import Portfolio, Holding
 
 User = get_user_model()
 
+logger = logging.getLogger(__name__)
+
 
 def test_portfolio_sync():
     """Test portfolio synchronization."""
@@ -47,7 +53,9 @@ def test_portfolio_sync():
     # Test portfolio service
     print("\n3. Testing PortfolioService...")
     try:
-        portfolio_service = PortfolioService(user, rh_account)
+        # One client for both services, so its session is set up once
+        rh_client = create_robinhood_client(rh_account)
+        portfolio_service = PortfolioService(user, rh_account, rh_client=rh_client)
         print("✅ PortfolioService initialized")
     except Exception as e:
         print(f"❌ Failed to initialize PortfolioService: {e}")
@@ -67,14 +75,13 @@ def test_portfolio_sync():
         print(f"   Synced at: {result['synced_at']}")
     except Exception as e:
         print(f"❌ Portfolio sync failed: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Portfolio sync failed")
         return False
     
     # Test holdings service
     print("\n5. Syncing holdings data...")
     try:
-        holdings_service = HoldingsService(user, rh_account)
+        holdings_service = HoldingsService(user, rh_account, rh_client=rh_client)
         holdings_result = holdings_service.sync_holdings_data()
         print(f"✅ Holdings sync completed!")
         print(f"   Created: {holdings_result['holdings_created']}")
@@ -82,14 +89,19 @@ def test_portfolio_sync():
         print(f"   Total: {holdings_result['total_holdings']}")
     except Exception as e:
         print(f"❌ Holdings sync failed: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Holdings sync failed")
         return False
     
+    # The summary and holdings reads are independent once both syncs are
+    # done, so fetch them together
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        summary_future = executor.submit(portfolio_service.get_portfolio_summary, use_cache=False)
+        holdings_future = executor.submit(holdings_service.get_holdings, use_cache=False)
+    
     # Display portfolio summary
     print("\n6. Getting portfolio summary...")
     try:
-        summary = portfolio_service.get_portfolio_summary(use_cache=False)
+        summary = summary_future.result()
         print(f"✅ Portfolio Summary:")
         print(f"   Total Value: ${summary['total_value']:,.2f}")
         print(f"   Total P/L: ${summary['total_pl']:,.2f} ({summary['total_pl_percent']:.2f}%)")
@@ -104,16 +116,20 @@ def test_portfolio_sync():
     # Display holdings
     print("\n7. Getting holdings...")
     try:
-        holdings = holdings_service.get_holdings(use_cache=False)
+        holdings = holdings_future.result()
         print(f"✅ Holdings ({len(holdings)} total):")
-        for holding in holdings[:10]:  # Show first 10
-            print(f"   {holding['symbol']:6} | "
-                  f"Qty: {holding['quantity']:>10} | "
-                  f"Price: ${holding['current_price']:>8.2f} | "
-                  f"Value: ${holding['market_value']:>10.2f} | "
-                  f"P/L: {holding['total_pl_percent']:>6.2f}%")
+        lines = [
+            f"   {holding['symbol']:6} | "
+            f"Qty: {holding['quantity']:>10} | "
+            f"Price: ${holding['current_price']:>8.2f} | "
+            f"Value: ${holding['market_value']:>10.2f} | "
+            f"P/L: {holding['total_pl_percent']:>6.2f}%"
+            for holding in holdings[:10]  # Show first 10
+        ]
         if len(holdings) > 10:
-            print(f"   ... and {len(holdings) - 10} more")
+            lines.append(f"   ... and {len(holdings) - 10} more")
+        if lines:
+            sys.stdout.write("\n".join(lines) + "\n")
     except Exception as e:
         print(f"❌ Failed to get holdings: {e}")
         return False